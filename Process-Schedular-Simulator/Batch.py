@@ -0,0 +1,119 @@
+import numpy as np
+
+POLICIES = ("FCFS", "SJF", "LJF", "Priority")
+PERCENTILES = (50, 90, 95, 99, 99.9)
+
+def replicates(n_replicates, n_jobs, seed=0, arrival_rate=1.0, mean_burst=4.0, burst_alpha=1.5):
+    # Same arrival and burst recipe as Workload.generate, one row per replicate.
+    rng = np.random.default_rng(seed)
+    arrival_time = np.cumsum(rng.exponential(1.0 / arrival_rate, (n_replicates, n_jobs)), axis=1)
+    if n_jobs:
+        arrival_time -= arrival_time[:, :1]
+    scale = mean_burst * (burst_alpha - 1) / burst_alpha if burst_alpha > 1 else mean_burst
+    burst_time = (rng.pareto(burst_alpha, (n_replicates, n_jobs)) + 1) * scale
+    return arrival_time, burst_time
+
+def dispatch_order(policy, arrival_time, burst_time, priority):
+    # Per-row ranks that match the tie breaking of the single-run schedulers.
+    if policy == "FCFS":
+        return np.argsort(arrival_time, axis=1, kind='stable')
+    if policy == "SJF":
+        return np.argsort(burst_time, axis=1, kind='stable')
+    if policy == "LJF":
+        return np.argsort(-burst_time, axis=1, kind='stable')
+    return np.lexsort((arrival_time, priority), axis=1)
+
+def fcfs_completions(arrival_time, burst_time):
+    # c[i] = max(c[i-1], a[i]) + b[i] unrolls to S[i] + max over j <= i of
+    # (a[j] - S[j-1]), where S is the running sum of bursts: two scans.
+    total = np.cumsum(burst_time, axis=1)
+    return total + np.maximum.accumulate(arrival_time - (total - burst_time), axis=1)
+
+def sorted_completions(arrival_time, burst_time):
+    # Columns are already in dispatch rank order, so each step runs the
+    # first ready column of every row. Done columns get an infinite arrival.
+    # This is one pass over the rows per job, O(n_jobs ** 2) per replicate.
+    rows = np.arange(len(arrival_time))
+    pending = arrival_time.copy()
+    completion_times = np.empty_like(arrival_time)
+    current_time = np.zeros(len(arrival_time))
+    for _ in range(arrival_time.shape[1]):
+        np.maximum(current_time, pending.min(axis=1), out=current_time)
+        current = (pending <= current_time[:, None]).argmax(axis=1)
+        current_time += burst_time[rows, current]
+        completion_times[rows, current] = current_time
+        pending[rows, current] = np.inf
+    return completion_times
+
+def evaluate_chunk(policy, arrival_time, burst_time, priority):
+    order = dispatch_order(policy, arrival_time, burst_time, priority)
+    arrival_time = np.take_along_axis(arrival_time, order, axis=1)
+    burst_time = np.take_along_axis(burst_time, order, axis=1)
+    if policy == "FCFS":
+        completion_times = fcfs_completions(arrival_time, burst_time)
+    else:
+        completion_times = sorted_completions(arrival_time, burst_time)
+    # Back to the caller's column order.
+    unsorted = np.empty_like(completion_times)
+    np.put_along_axis(unsorted, order, completion_times, axis=1)
+    return unsorted
+
+def distribution(values, percentiles):
+    stats = {"mean": float(values.mean()), "std": float(values.std())}
+    for p, value in zip(percentiles, np.percentile(values, percentiles)):
+        stats[f"p{p:g}"] = float(value)
+    stats["max"] = float(values.max())
+    return stats
+
+def evaluate(arrival_time, burst_time, policy="FCFS", priority=None, percentiles=PERCENTILES, tail=99, chunk_cells=2 ** 22, keep_times=False):
+    # Runs one policy over every row of (n_replicates, n_jobs) arrays at once,
+    # without Gantt output. Returns per-replicate summaries (the same fields
+    # as Scheduler.summary plus max and tail waiting) and their distributions
+    # across replicates.
+    if policy not in POLICIES:
+        raise ValueError(f"Unknown policy {policy!r}, choose from {', '.join(POLICIES)}.")
+    arrival_time = np.atleast_2d(np.asarray(arrival_time, dtype=np.float64))
+    burst_time = np.atleast_2d(np.asarray(burst_time, dtype=np.float64))
+    if arrival_time.shape != burst_time.shape:
+        raise ValueError("arrival_time and burst_time must have the same shape.")
+    if policy == "Priority":
+        if priority is None:
+            raise ValueError("The Priority policy needs a priority array.")
+        priority = np.broadcast_to(np.asarray(priority, dtype=np.float64), arrival_time.shape)
+    n_replicates, n_jobs = arrival_time.shape
+    if not n_jobs:
+        raise ValueError("Every replicate needs at least one job.")
+
+    tail_name = f"p{tail:g}_waiting"
+    per_replicate = {name: np.empty(n_replicates) for name in ("average_turnaround", "average_waiting", "makespan", "throughput", "max_waiting", tail_name)}
+    times = {name: np.empty((n_replicates, n_jobs)) for name in ("completion_times", "turnaround_times", "waiting_times")} if keep_times else None
+
+    step = max(1, chunk_cells // n_jobs)
+    for start in range(0, n_replicates, step):
+        chunk = slice(start, start + step)
+        completion_times = evaluate_chunk(policy, arrival_time[chunk], burst_time[chunk], None if priority is None else priority[chunk])
+        turnaround_times = completion_times - arrival_time[chunk]
+        waiting_times = turnaround_times - burst_time[chunk]
+        makespan = completion_times.max(axis=1) - arrival_time[chunk].min(axis=1)
+
+        per_replicate["average_turnaround"][chunk] = turnaround_times.mean(axis=1)
+        per_replicate["average_waiting"][chunk] = waiting_times.mean(axis=1)
+        per_replicate["makespan"][chunk] = makespan
+        per_replicate["throughput"][chunk] = np.divide(n_jobs, makespan, out=np.zeros_like(makespan), where=makespan > 0)
+        per_replicate["max_waiting"][chunk] = waiting_times.max(axis=1)
+        per_replicate[tail_name][chunk] = np.percentile(waiting_times, tail, axis=1)
+        if keep_times:
+            times["completion_times"][chunk] = completion_times
+            times["turnaround_times"][chunk] = turnaround_times
+            times["waiting_times"][chunk] = waiting_times
+
+    result = {
+        "policy": policy,
+        "replicates": n_replicates,
+        "jobs": n_jobs,
+        "per_replicate": per_replicate,
+        "distribution": {name: distribution(values, percentiles) for name, values in per_replicate.items()},
+    }
+    if keep_times:
+        result.update(times)
+    return result
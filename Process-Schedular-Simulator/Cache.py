@@ -0,0 +1,125 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+from Workload import Workload
+
+class ResultCache:
+    # Results keyed by a hash of the workload columns, the scheduler class
+    # and its parameters. An LRU tier in memory is bounded by max_bytes; the
+    # optional disk tier keeps one directory of .npy files per result and
+    # maps them back in read-only.
+    def __init__(self, max_bytes=256 * 2 ** 20, directory=None):
+        self.max_bytes = max_bytes
+        self.directory = directory
+        self.memory = OrderedDict()
+        self.memory_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, algorithm, workload, params):
+        digest = hashlib.sha256()
+        digest.update(algorithm.__name__.encode())
+        digest.update(repr(sorted(params.items())).encode())
+        for column in (workload.process_id, workload.arrival_time, workload.burst_time, workload.priority):
+            digest.update(np.ascontiguousarray(column).tobytes())
+        return digest.hexdigest()
+
+    def get(self, key):
+        with self.lock:
+            return self.lookup(key)
+
+    def lookup(self, key):
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            self.hits += 1
+            return self.memory[key]
+        state = self.load(key)
+        if state is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.remember(key, state)
+        return state
+
+    def put(self, key, state):
+        # Cached arrays are private read-only copies, like the mapped ones
+        # from disk, so no caller can change what later hits get back.
+        state = {name: self.freeze(array) for name, array in state.items()}
+        with self.lock:
+            self.remember(key, state)
+        if self.directory is not None:
+            self.store(key, state)
+
+    @staticmethod
+    def freeze(array):
+        array = np.array(array)
+        array.flags.writeable = False
+        return array
+
+    def remember(self, key, state):
+        size = sum(array.nbytes for array in state.values())
+        if size > self.max_bytes:
+            return
+        if key in self.memory:
+            self.memory_bytes -= sum(array.nbytes for array in self.memory.pop(key).values())
+        self.memory[key] = state
+        self.memory_bytes += size
+        while self.memory_bytes > self.max_bytes:
+            _, evicted = self.memory.popitem(last=False)
+            self.memory_bytes -= sum(array.nbytes for array in evicted.values())
+
+    def path(self, key):
+        return os.path.join(self.directory, key[:2], key)
+
+    def load(self, key):
+        if self.directory is None or not os.path.isdir(self.path(key)):
+            return None
+        path = self.path(key)
+        return {
+            name[:-4]: np.load(os.path.join(path, name), mmap_mode='r')
+            for name in os.listdir(path) if name.endswith('.npy')
+        }
+
+    def store(self, key, state):
+        path = self.path(key)
+        if os.path.isdir(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        staging = tempfile.mkdtemp(dir=os.path.dirname(path))
+        for name, array in state.items():
+            np.save(os.path.join(staging, name + '.npy'), array)
+        try:
+            os.rename(staging, path)
+        except OSError:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+            self.memory_bytes = 0
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            os.makedirs(self.directory, exist_ok=True)
+
+    def run(self, algorithm, processes, **params):
+        return self.resolve(algorithm(Workload.coerce(processes), **params), params)
+
+    def resolve(self, scheduler, params):
+        # Runs or restores an already constructed scheduler, so callers can
+        # attach stats or a progress monitor first. `params` must be the
+        # keyword arguments it was built with.
+        scheduler.cache_key = self.key(type(scheduler), scheduler.processes, params)
+        state = self.get(scheduler.cache_key)
+        if state is None:
+            scheduler.run()
+            self.put(scheduler.cache_key, scheduler.cache_state())
+        else:
+            scheduler.restore_state(state)
+        return scheduler
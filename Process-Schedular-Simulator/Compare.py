@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import numpy as np
+from Logic import ALGORITHMS
+from Workload import Workload
+
+FLOAT_COLUMNS = ('arrival_time', 'burst_time', 'priority')
+
+class SharedWorkloads:
+    # All workloads packed back to back into two shared memory blocks, one
+    # for the float columns and one for the process ids, so workers can map
+    # them instead of unpickling a copy per job.
+    def __init__(self, workloads):
+        workloads = [Workload.coerce(w) for w in workloads]
+        self.offsets = np.zeros(len(workloads) + 1, dtype=np.int64)
+        self.offsets[1:] = np.cumsum([len(w) for w in workloads])
+        total = int(self.offsets[-1])
+
+        self.float_block = shared_memory.SharedMemory(create=True, size=max(1, 3 * total * 8))
+        self.id_block = shared_memory.SharedMemory(create=True, size=max(1, total * 8))
+        columns = np.ndarray((3, total), dtype=np.float64, buffer=self.float_block.buf)
+        process_ids = np.ndarray(total, dtype=np.int64, buffer=self.id_block.buf)
+        for w, start, end in zip(workloads, self.offsets[:-1], self.offsets[1:]):
+            for row, name in enumerate(FLOAT_COLUMNS):
+                columns[row, start:end] = getattr(w, name)
+            process_ids[start:end] = w.process_id
+        del columns, process_ids
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def handle(self):
+        return self.float_block.name, self.id_block.name, self.offsets
+
+    def close(self):
+        for block in (self.float_block, self.id_block):
+            block.close()
+            block.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+_attached = {}
+
+def attach(handle, index):
+    float_name, id_name, offsets = handle
+    if float_name not in _attached:
+        blocks = []
+        for name in (float_name, id_name):
+            # Pool workers report to the parent's resource tracker, so the
+            # parent's unlink in SharedWorkloads.close is the only cleanup.
+            blocks.append(shared_memory.SharedMemory(name=name))
+        total = int(offsets[-1])
+        columns = np.ndarray((3, total), dtype=np.float64, buffer=blocks[0].buf)
+        process_ids = np.ndarray(total, dtype=np.int64, buffer=blocks[1].buf)
+        columns.flags.writeable = False
+        process_ids.flags.writeable = False
+        _attached[float_name] = (blocks, columns, process_ids)
+
+    _, columns, process_ids = _attached[float_name]
+    start, end = offsets[index], offsets[index + 1]
+    return Workload(process_ids[start:end], *columns[:, start:end])
+
+def run_one(workload, algorithm):
+    scheduler = ALGORITHMS[algorithm](workload)
+    scheduler.run()
+    summary = scheduler.summary()
+    summary["max_waiting"] = float(scheduler.waiting_times.max(initial=0))
+    summary["p95_waiting"] = float(np.percentile(scheduler.waiting_times, 95)) if len(workload) else 0.0
+    return summary
+
+def run_shared(handle, index, algorithm):
+    return run_one(attach(handle, index), algorithm)
+
+def compare(workloads, algorithms=None, max_workers=None, chunksize=1):
+    if isinstance(workloads, Workload) or (workloads and isinstance(workloads[0], dict)):
+        workloads = [workloads]
+    algorithms = list(algorithms or ALGORITHMS)
+    for algorithm in algorithms:
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm {algorithm!r}.")
+
+    # One task per (workload, algorithm) pair, so a single workload still
+    # spreads its algorithms over the pool.
+    pairs = [(index, algorithm) for index in range(len(workloads)) for algorithm in algorithms]
+    if max_workers == 1:
+        coerced = [Workload.coerce(w) for w in workloads]
+        results = [run_one(coerced[index], algorithm) for index, algorithm in pairs]
+    else:
+        with SharedWorkloads(workloads) as shared, ProcessPoolExecutor(max_workers=max_workers or os.cpu_count()) as pool:
+            indices = [index for index, _ in pairs]
+            results = list(pool.map(run_shared, [shared.handle()] * len(pairs), indices, [algorithm for _, algorithm in pairs], chunksize=chunksize))
+
+    return [
+        {"workload": index, "algorithm": algorithm, "num_processes": len(workloads[index]), **summary}
+        for (index, algorithm), summary in zip(pairs, results)
+    ]
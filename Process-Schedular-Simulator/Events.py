@@ -0,0 +1,400 @@
+import heapq
+import math
+from collections import deque
+from functools import partial
+import numpy as np
+from Logic import EPSILON, ReadyQueue, ResponseRatioQueue
+from Workload import Workload
+
+ARRIVAL, IO_DONE, CPU_DONE, SLICE, TICK = range(5)
+
+class BurstWorkload:
+    # Processes with alternating CPU and I/O bursts, starting and ending on
+    # the CPU. Bursts of all processes sit back to back in one array, process
+    # i owning bursts[offsets[i]:offsets[i + 1]]. devices gives the device of
+    # each I/O burst and is -1 on CPU bursts.
+    __slots__ = ('process_id', 'arrival_time', 'priority', 'bursts', 'devices', 'offsets')
+
+    def __init__(self, process_id, arrival_time, bursts, offsets, devices=None, priority=None):
+        self.process_id = np.asarray(process_id, dtype=np.int64)
+        self.arrival_time = np.asarray(arrival_time, dtype=np.float64)
+        self.bursts = np.asarray(bursts, dtype=np.float64)
+        self.offsets = np.asarray(offsets, dtype=np.int64)
+        if priority is None:
+            self.priority = np.zeros(len(self.process_id), dtype=np.float64)
+        else:
+            self.priority = np.asarray(priority, dtype=np.float64)
+
+        if not (len(self.process_id) == len(self.arrival_time) == len(self.priority) == len(self.offsets) - 1):
+            raise ValueError("All workload columns must have the same length.")
+        if self.offsets[-1] != len(self.bursts):
+            raise ValueError("offsets must end at the number of bursts.")
+        lengths = np.diff(self.offsets)
+        if (lengths < 1).any() or (lengths % 2 == 0).any():
+            raise ValueError("Every process needs an odd number of bursts, alternating CPU and I/O.")
+        io = self.io_mask()
+        if devices is None:
+            self.devices = np.where(io, 0, -1)
+        else:
+            self.devices = np.where(io, np.asarray(devices, dtype=np.int64), -1)
+
+    def io_mask(self):
+        positions = np.arange(len(self.bursts)) - np.repeat(self.offsets[:-1], np.diff(self.offsets))
+        return positions % 2 == 1
+
+    @classmethod
+    def from_records(cls, processes):
+        # Each record has "bursts": [cpu, io, cpu, ...] and optionally
+        # "devices" with one entry per I/O burst.
+        offsets = np.zeros(len(processes) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(p["bursts"]) for p in processes])
+        devices = []
+        for p in processes:
+            io_devices = p.get("devices") or [0] * (len(p["bursts"]) // 2)
+            for device in io_devices:
+                devices.extend((-1, device))
+            devices.append(-1)
+        return cls(
+            [p["process_id"] for p in processes],
+            [p["arrival_time"] for p in processes],
+            [burst for p in processes for burst in p["bursts"]],
+            offsets,
+            devices,
+            [p.get("priority", 0) for p in processes],
+        )
+
+    @classmethod
+    def coerce(cls, processes):
+        if isinstance(processes, cls):
+            return processes
+        workload = Workload.coerce(processes)
+        # A single CPU burst each, so plain workloads run unchanged.
+        return cls(workload.process_id, workload.arrival_time, workload.burst_time,
+                   np.arange(len(workload) + 1), priority=workload.priority)
+
+    def __len__(self):
+        return len(self.process_id)
+
+    @property
+    def num_devices(self):
+        return int(self.devices.max(initial=-1)) + 1
+
+    @classmethod
+    def generate(cls, n, seed=0, arrival_rate=1.0, mean_cpu=2.0, mean_io=6.0, mean_cpu_bursts=4.0, devices=2, priority_levels=5):
+        # Poisson arrivals, a geometric number of CPU bursts per process and
+        # exponential CPU and I/O burst lengths, each I/O on a random device.
+        rng = np.random.default_rng(seed)
+        arrival_time = np.cumsum(rng.exponential(1.0 / arrival_rate, n))
+        if n:
+            arrival_time -= arrival_time[0]
+        cpu_bursts = rng.geometric(1.0 / mean_cpu_bursts, n)
+        offsets = np.zeros(n + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum(2 * cpu_bursts - 1)
+        total = int(offsets[-1])
+        io = (np.arange(total) - np.repeat(offsets[:-1], 2 * cpu_bursts - 1)) % 2 == 1
+        bursts = np.where(io, rng.exponential(mean_io, total), rng.exponential(mean_cpu, total))
+        return cls(np.arange(1, n + 1), arrival_time, bursts, offsets,
+                   rng.integers(0, devices, total), rng.integers(1, priority_levels + 1, n))
+
+class Policy:
+    # A selection function for the event core: key(i) orders the ready set,
+    # smallest first. Preemptive policies are checked again whenever a job
+    # becomes ready, and a finite quantum time-slices the running job.
+    interval = None
+    # Whether a preempted job goes back to the head of the ready order.
+    resume_first = False
+
+    def __init__(self, key, preemptive=False, quantum=math.inf):
+        self.key_function = key
+        self.preemptive = preemptive
+        self.slice = quantum
+
+    def bind(self, simulator):
+        self.simulator = simulator
+        self.key = partial(self.key_function, simulator)
+        return ReadyQueue(self.key)
+
+    def quantum(self, i):
+        return self.slice
+
+    def expired(self, i):
+        pass
+
+    def tick(self, ready):
+        pass
+
+class ResponseRatioPolicy(Policy):
+    # HRRN over the current CPU burst and the time it became ready.
+    def __init__(self):
+        super().__init__(None)
+
+    def bind(self, simulator):
+        self.simulator = simulator
+        return ResponseRatioQueue(simulator.ready_since, simulator.cpu_burst)
+
+class FeedbackPolicy(Policy):
+    # MLFQ: jobs keep their level across I/O, drop a level when they use up
+    # its quantum and preempt anything on a lower level. A boost every
+    # boost_interval moves the whole ready order to the top level, keeping
+    # it level by level like the single-run MLFQ does.
+    resume_first = True
+
+    def __init__(self, levels=3, quanta=None, boost_interval=None):
+        super().__init__(None, preemptive=True)
+        self.quanta = [2 * 2 ** level for level in range(levels)] if quanta is None else list(quanta)
+        if len(self.quanta) != levels:
+            raise ValueError("MLFQ needs one time quantum per level.")
+        self.levels = levels
+        self.interval = boost_interval
+
+    def bind(self, simulator):
+        self.simulator = simulator
+        self.level = [0] * simulator.num_processes
+        return ReadyQueue(self.key)
+
+    def key(self, i):
+        return (self.level[i], self.simulator.sequence[i])
+
+    def quantum(self, i):
+        return self.quanta[self.level[i]]
+
+    def expired(self, i):
+        self.level[i] = min(self.level[i] + 1, self.levels - 1)
+
+    def tick(self, ready):
+        simulator = self.simulator
+        self.level = [0] * len(self.level)
+        for _, i in sorted(ready.heap):
+            simulator.tail += 1
+            simulator.sequence[i] = simulator.tail
+        ready.heap = [(self.key(i), i) for _, i in ready.heap]
+        heapq.heapify(ready.heap)
+
+POLICIES = {
+    "FCFS": lambda: Policy(lambda sim, i: sim.ready_since[i]),
+    "Priority": lambda: Policy(lambda sim, i: (sim.priority[i], sim.ready_since[i])),
+    "Priority_pre": lambda: Policy(lambda sim, i: (sim.priority[i], sim.ready_since[i]), preemptive=True),
+    "HRRN": ResponseRatioPolicy,
+    "LJF": lambda: Policy(lambda sim, i: -sim.cpu_burst[i]),
+    "SJF": lambda: Policy(lambda sim, i: sim.cpu_burst[i]),
+    # LRTF re-picks every time unit like the tick-based scheduler does.
+    "LRTF": lambda: Policy(lambda sim, i: -sim.remaining[i], preemptive=True, quantum=1.0),
+    "SRTF": lambda: Policy(lambda sim, i: sim.remaining[i], preemptive=True),
+    "RoundRobin": lambda quantum=2: Policy(lambda sim, i: sim.sequence[i], quantum=quantum),
+    "MLFQ": FeedbackPolicy,
+}
+
+class EventScheduler:
+    # One CPU and a set of FIFO I/O devices driven by a single heap of
+    # (time, kind, target, version) events. All events at the same time are
+    # applied before the policy picks the next job. CPU completion and slice
+    # events carry the CPU's version and are dropped once it moves on.
+    def __init__(self, processes, policy="FCFS", **params):
+        self.processes = BurstWorkload.coerce(processes)
+        self.num_processes = len(self.processes)
+        self.policy_name = policy if isinstance(policy, str) else type(policy).__name__
+        if isinstance(policy, str):
+            if policy not in POLICIES:
+                raise ValueError(f"Unknown policy {policy!r}, choose from {', '.join(POLICIES)}.")
+            policy = POLICIES[policy](**params)
+        self.policy = policy
+        self.num_devices = max(1, self.processes.num_devices)
+
+    def run(self):
+        processes = self.processes
+        n = self.num_processes
+        bursts = processes.bursts.tolist()
+        devices = processes.devices.tolist()
+        offsets = processes.offsets.tolist()
+        arrival_time = processes.arrival_time.tolist()
+        order = np.argsort(processes.arrival_time, kind='stable').tolist()
+        self.priority = processes.priority.tolist()
+
+        self.ready_since = [0.0] * n
+        self.cpu_burst = [0.0] * n
+        self.remaining = [0.0] * n
+        self.sequence = [0] * n
+        self.head = self.tail = 0
+        position = offsets[:-1]
+        slice_left = [0.0] * n
+        slice_tick = [0] * n
+        queued_at = [0.0] * n
+        waiting = [0.0] * n
+        first_start = [math.nan] * n
+        completion = [0.0] * n
+        remaining = self.remaining
+
+        policy = self.policy
+        ready = policy.bind(self)
+        preemptive = policy.preemptive
+        key = policy.key if preemptive else None
+        device_queue = [deque() for _ in range(self.num_devices)]
+        device_job = [None] * self.num_devices
+        device_busy = [0.0] * self.num_devices
+
+        # Only the next arrival sits in the calendar, the rest wait in order,
+        # so the heap holds a handful of events however many jobs there are.
+        events = [(arrival_time[order[0]], ARRIVAL, 0, 0)] if n else []
+        if policy.interval is not None and n:
+            events.append((policy.interval, TICK, 0, 0))
+            heapq.heapify(events)
+        instant = []
+        push, pop = heapq.heappush, heapq.heappop
+
+        running = None
+        last = None
+        started = 0.0
+        version = 0
+        busy = 0.0
+        ticks = 0
+        finished = 0
+        processed = 0
+        self.context_switches = 0
+        self.preemptions = 0
+
+        def make_ready(i, now, first=False):
+            if first:
+                self.head -= 1
+                self.sequence[i] = self.head
+            else:
+                self.tail += 1
+                self.sequence[i] = self.tail
+            queued_at[i] = now
+            ready.push(i, now)
+
+        def start_cpu_burst(i, now):
+            self.cpu_burst[i] = remaining[i] = bursts[position[i]]
+            self.ready_since[i] = now
+            slice_left[i] = 0.0
+            make_ready(i, now)
+
+        def start_io(d, i, now):
+            device_job[d] = i
+            push(events, (now + bursts[position[i]], IO_DONE, d, 0))
+
+        while events:
+            now = events[0][0]
+            # Events an ulp apart are the same instant for fractional times.
+            # When several fall within the tolerance they move to a heap
+            # without the time, so they apply in the order exactly equal
+            # times would get. A lone event skips it.
+            tolerance = EPSILON * (1.0 + abs(now))
+            while True:
+                if not instant:
+                    if not events or events[0][0] - now > tolerance:
+                        break
+                    _, kind, target, event_version = pop(events)
+                    if events and events[0][0] - now <= tolerance:
+                        push(instant, (kind, target, event_version))
+                        continue
+                else:
+                    while events and events[0][0] - now <= tolerance:
+                        push(instant, pop(events)[1:])
+                    kind, target, event_version = pop(instant)
+                processed += 1
+                if kind == ARRIVAL:
+                    if target + 1 < n:
+                        push(events, (arrival_time[order[target + 1]], ARRIVAL, target + 1, 0))
+                    start_cpu_burst(order[target], now)
+                elif kind == IO_DONE:
+                    i = device_job[target]
+                    device_busy[target] += bursts[position[i]]
+                    device_job[target] = None
+                    if device_queue[target]:
+                        start_io(target, device_queue[target].popleft(), now)
+                    position[i] += 1
+                    start_cpu_burst(i, now)
+                elif kind == TICK:
+                    # The running job goes back first in line so the policy
+                    # can reorder everything, and every time slice restarts.
+                    if running is not None:
+                        remaining[running] -= now - started
+                        busy += now - started
+                        make_ready(running, now, True)
+                        running = None
+                        version += 1
+                    ticks += 1
+                    policy.tick(ready)
+                    if finished < n:
+                        push(events, (now + policy.interval, TICK, 0, 0))
+                elif event_version == version:
+                    i = running
+                    elapsed = now - started
+                    busy += elapsed
+                    running = None
+                    version += 1
+                    if kind == SLICE:
+                        remaining[i] -= elapsed
+                        slice_left[i] = 0.0
+                        policy.expired(i)
+                        make_ready(i, now)
+                        continue
+                    remaining[i] = 0.0
+                    position[i] += 1
+                    if position[i] == offsets[i + 1]:
+                        completion[i] = now
+                        finished += 1
+                        continue
+                    d = devices[position[i]]
+                    if device_job[d] is None:
+                        start_io(d, i, now)
+                    else:
+                        device_queue[d].append(i)
+
+            if running is not None and preemptive and len(ready):
+                elapsed = now - started
+                remaining[running] -= elapsed
+                slice_left[running] -= elapsed
+                busy += elapsed
+                started = now
+                if ready.heap[0] < (key(running), running):
+                    self.preemptions += 1
+                    version += 1
+                    make_ready(running, now, policy.resume_first)
+                    running = None
+
+            if running is None and len(ready):
+                i = ready.pop(now)
+                waiting[i] += now - queued_at[i]
+                if math.isnan(first_start[i]):
+                    first_start[i] = now
+                if i != last:
+                    self.context_switches += 1
+                running = last = i
+                started = now
+                version += 1
+                # A slice or burst within the tolerance of its end is used up,
+                # or a ~1e-16 leftover would cost the job a trip round the queue.
+                if slice_left[i] <= tolerance or slice_tick[i] != ticks:
+                    slice_left[i] = policy.quantum(i)
+                    slice_tick[i] = ticks
+                if remaining[i] - slice_left[i] > tolerance:
+                    push(events, (now + slice_left[i], SLICE, i, version))
+                else:
+                    push(events, (now + remaining[i], CPU_DONE, i, version))
+
+        self.events = processed
+        self.completion_times = np.array(completion)
+        self.turnaround_times = self.completion_times - processes.arrival_time
+        self.response_times = np.array(first_start) - processes.arrival_time
+        self.waiting_times = np.array(waiting)
+        self.cpu_busy = busy
+        self.device_busy = np.array(device_busy)
+
+    def summary(self):
+        summary = {"events": self.events, "context_switches": self.context_switches, "preemptions": self.preemptions}
+        makespan = float(self.completion_times.max() - self.processes.arrival_time.min()) if self.num_processes else 0.0
+        if makespan <= 0:
+            summary.update(average_turnaround=0.0, average_waiting=0.0, average_response=0.0, makespan=0.0,
+                           throughput=0.0, cpu_utilization=0.0, device_utilization=[0.0] * self.num_devices)
+            return summary
+        summary.update(
+            average_turnaround=float(self.turnaround_times.mean()),
+            average_waiting=float(self.waiting_times.mean()),
+            average_response=float(self.response_times.mean()),
+            makespan=makespan,
+            throughput=self.num_processes / makespan,
+            cpu_utilization=self.cpu_busy / makespan,
+            device_utilization=(self.device_busy / makespan).tolist(),
+        )
+        return summary
@@ -1,15 +1,67 @@
+from collections import OrderedDict
 from Logic import *
+from Cache import ResultCache
+from Stats import Cancelled, ProgressMonitor
+from Models import WorkloadModel, ResultsModel
+from cli import read_workload, write_metrics, write_workload
+from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from PyQt5.QtCore import QThread, pyqtSignal
 from PyQt5.QtWidgets import (
     QMainWindow, QVBoxLayout, QPushButton,
-    QComboBox, QHBoxLayout, QHeaderView, QTableWidget,
-    QTableWidgetItem, QLabel, QWidget, QMessageBox
+    QComboBox, QHBoxLayout, QHeaderView, QTableView,
+    QLabel, QWidget, QMessageBox, QDoubleSpinBox,
+    QProgressBar, QFileDialog
 )
 
+class RunWorker(QThread):
+    progress = pyqtSignal(int, int)
+    segments = pyqtSignal(object)
+    done = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, cache, scheduler, params):
+        super().__init__()
+        self.cache = cache
+        self.scheduler = scheduler
+        self.params = params
+        self.drawn = 0
+        self.monitor = ProgressMonitor(scheduler.num_processes, self.report)
+        scheduler.stats = self.monitor
+
+    def cancel(self):
+        self.monitor.cancel()
+
+    def report(self, completed):
+        self.progress.emit(completed, self.monitor.total)
+        # Past max_segments the final chart is downsampled anyway, so stop
+        # streaming segments and let the finished run draw it.
+        if self.drawn < self.scheduler.max_segments:
+            chunk = self.scheduler.gantt_chart.tail(self.drawn)
+            if len(chunk[0]):
+                self.drawn += len(chunk[0])
+                self.segments.emit(chunk)
+
+    def run(self):
+        try:
+            scheduler = self.cache.resolve(self.scheduler, self.params)
+        except Cancelled:
+            return
+        except Exception as e:
+            self.failed.emit(str(e))
+            return
+        scheduler.stats = None
+        self.done.emit(scheduler)
+
 class App(QMainWindow):
     def __init__(self):
         super().__init__()
         self.title = 'Process Scheduling Simulator'
+        self.cache = ResultCache()
+        self.figures = OrderedDict()
+        self.max_figures = 8
+        self.worker = None
+        self.workers = set()
         self.initUI()
 
     def initUI(self):
@@ -27,15 +79,24 @@ class App(QMainWindow):
         top_layout.addLayout(left_layout, 1)
         
         self.algorithm_combo = QComboBox()
-        self.algorithm_combo.addItems(["FCFS", "Priority", "Priority (Preemitive)"])
+        self.algorithm_combo.addItems(["FCFS", "Priority", "Priority (Preemitive)", "SJF", "LJF", "HRRN", "SRTF", "LRTF", "Round Robin", "MLFQ"])
         self.algorithm_combo.currentTextChanged.connect(self.adjust_columns)
         
         left_layout.addWidget(QLabel("Select Algorithm:"))
         left_layout.addWidget(self.algorithm_combo)
+
+        self.quantum_spin = QDoubleSpinBox()
+        self.quantum_spin.setMinimum(0.1)
+        self.quantum_spin.setValue(2)
+        self.quantum_spin.setEnabled(False)
+        left_layout.addWidget(QLabel("Time Quantum:"))
+        left_layout.addWidget(self.quantum_spin)
         
-        self.process_table = QTableWidget()
-        self.process_table.setColumnCount(2)
-        self.process_table.setHorizontalHeaderLabels(["Arrival Time", "Burst Time"])
+        self.process_model = WorkloadModel()
+        self.process_table = QTableView()
+        self.process_table.setModel(self.process_model)
+        self.process_table.setColumnHidden(2, True)
+        self.process_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         left_layout.addWidget(self.process_table)
         
         button_layout = QHBoxLayout()
@@ -51,10 +112,36 @@ class App(QMainWindow):
         button_layout.addWidget(clear_button)
         
         left_layout.addLayout(button_layout)
+
+        file_layout = QHBoxLayout()
+
+        import_button = QPushButton('Import...')
+        import_button.clicked.connect(self.import_workload)
+        file_layout.addWidget(import_button)
+
+        export_button = QPushButton('Export...')
+        export_button.clicked.connect(self.export_workload)
+        file_layout.addWidget(export_button)
+
+        self.export_results_button = QPushButton('Export Results...')
+        self.export_results_button.clicked.connect(self.export_results)
+        self.export_results_button.setEnabled(False)
+        file_layout.addWidget(self.export_results_button)
+
+        left_layout.addLayout(file_layout)
         
         self.run_button = QPushButton('Run', self)
         self.run_button.clicked.connect(self.run_algorithm)
         left_layout.addWidget(self.run_button)
+
+        self.cancel_button = QPushButton('Cancel', self)
+        self.cancel_button.clicked.connect(self.cancel_run)
+        self.cancel_button.setEnabled(False)
+        left_layout.addWidget(self.cancel_button)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        left_layout.addWidget(self.progress_bar)
         
         right_layout = QVBoxLayout()
         top_layout.addLayout(right_layout, 2)
@@ -66,130 +153,191 @@ class App(QMainWindow):
         bottom_layout = QVBoxLayout()
         main_layout.addLayout(bottom_layout)
         
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(6)
-        self.results_table.setHorizontalHeaderLabels(["Process", "Arrival Time", "Burst Time", "Turnaround Time", "Waiting Time", "Completion Time"])        
+        self.results_model = ResultsModel()
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.results_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.results_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
         
         bottom_layout.addWidget(self.results_table)
 
     def adjust_columns(self):
-        if self.algorithm_combo.currentText() == "Priority" or self.algorithm_combo.currentText() == "Priority (Preemitive)":
-            self.process_table.setColumnCount(3)
-            self.process_table.setHorizontalHeaderLabels(["Arrival Time", "Burst Time", "Priority"])
-        else:
-            self.process_table.setColumnCount(2)
-            self.process_table.setHorizontalHeaderLabels(["Arrival Time", "Burst Time"])
+        self.quantum_spin.setEnabled(self.algorithm_combo.currentText() in ("Round Robin", "MLFQ"))
+        uses_priority = self.algorithm_combo.currentText() == "Priority" or self.algorithm_combo.currentText() == "Priority (Preemitive)"
+        self.process_table.setColumnHidden(2, not uses_priority)
 
     def add_process(self):
-        row_count = self.process_table.rowCount()
-        self.process_table.insertRow(row_count)
-        for i in range(self.process_table.columnCount()):
-            self.process_table.setItem(row_count, i, QTableWidgetItem(""))
+        self.process_model.add_row()
+
+    def import_workload(self):
+        path, _ = QFileDialog.getOpenFileName(self, "Import Workload", "", "Workloads (*.csv *.json *.jsonl)")
+        if not path:
+            return
+        try:
+            self.process_model.set_workload(read_workload(path))
+        except (OSError, ValueError) as e:
+            self.show_error_message(f"Could not import {path}: {e}")
+
+    def export_workload(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Workload", "", "CSV (*.csv);;JSON (*.json)")
+        if not path:
+            return
+        try:
+            with open(path, 'w', newline='') as stream:
+                write_workload(self.process_model.workload(), stream, 'json' if path.lower().endswith('.json') else 'csv')
+        except OSError as e:
+            self.show_error_message(f"Could not export {path}: {e}")
+
+    def export_results(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Export Results", "", "CSV (*.csv);;JSON (*.json)")
+        if not path:
+            return
+        scheduler = self.results_model.scheduler
+        try:
+            with open(path, 'w', newline='') as stream:
+                write_metrics({type(scheduler).__name__: scheduler}, stream, 'json' if path.lower().endswith('.json') else 'csv')
+        except OSError as e:
+            self.show_error_message(f"Could not export {path}: {e}")
 
-    
 
     def run_algorithm(self):
         algorithm = self.algorithm_combo.currentText()
-        processes = []
-        
-        for i in range(self.process_table.rowCount()):
-            arrival_time_item = self.process_table.item(i, 0)
-            burst_time_item = self.process_table.item(i, 1)
+        processes = self.process_model.workload()
+        uses_priority = algorithm == "Priority" or algorithm == "Priority (Preemitive)"
 
-            if not (arrival_time_item and arrival_time_item.text().strip() and
-                    burst_time_item and burst_time_item.text().strip()):
-                self.show_error_message("Please fill in all the fields.")
-                return
-            try:
-                arrival_time = float(arrival_time_item.text())
-                burst_time = float(burst_time_item.text())
-                
-                if arrival_time < 0 or burst_time < 0:
-                    raise ValueError("Arrival time and burst time must be non-negative.")
-            except ValueError as e:
-                self.show_error_message(f"Please enter valid numbers for arrival time and burst time: {e}")
+        if np.isnan(processes.arrival_time).any() or np.isnan(processes.burst_time).any() or (
+                uses_priority and np.isnan(processes.priority).any()):
+            self.show_error_message("Please fill in all the fields.")
+            return
+        if (processes.arrival_time < 0).any() or (processes.burst_time < 0).any():
+            self.show_error_message("Please enter valid numbers for arrival time and burst time: Arrival time and burst time must be non-negative.")
+            return
+        if uses_priority:
+            if (processes.priority <= 0).any():
+                self.show_error_message("Please enter valid numbers for priority: Priority must be greater than zero.")
                 return
-              
-            if algorithm == "Priority" or algorithm == "Priority (Preemitive)":
-                priority_item = self.process_table.item(i, 2)
-                    
-                if priority_item is None or not priority_item.text().strip():
-                    self.show_error_message("Please fill in all the fields.")
-                    return
-                try:
-                    priority = float(priority_item.text())
-                    
-                    if priority <= 0:
-                        raise ValueError("Priority must be greater than zero.")
-                except ValueError as e:
-                    self.show_error_message(f"Please enter valid numbers for priority: {e}")
-                    return
-                
-                processes.append({"process_id": i + 1, "arrival_time": arrival_time, "burst_time": burst_time, "priority": priority})
-            else:
-                processes.append({"process_id": i + 1, "arrival_time": arrival_time, "burst_time": burst_time})
-                            
-        if not processes:
+        else:
+            processes.priority[:] = 0
+
+        if not len(processes):
             self.show_error_message("Please add at least one process.")
             return
         
+        params = {}
         if algorithm == "FCFS":
-            scheduler = FCFS(processes)
+            cls = FCFS
         elif algorithm == "Priority":
-            scheduler = Priority(processes)
+            cls = Priority
         elif algorithm == "Priority (Preemitive)":
-            scheduler = Priority_pre(processes)
-       
-        
-        scheduler.run()
+            cls = Priority_pre
+        elif algorithm == "Round Robin":
+            cls = RoundRobin
+            params["quantum"] = self.quantum_spin.value()
+        elif algorithm == "MLFQ":
+            cls = MLFQ
+            quantum = self.quantum_spin.value()
+            params["quanta"] = [quantum, 2 * quantum, 4 * quantum]
+        else:
+            cls = ALGORITHMS[algorithm]
+
+        # A new run supersedes the one in flight; the old thread stops at its
+        # next scheduling decision and its signals are ignored from now on.
+        if self.worker is not None:
+            self.worker.cancel()
+        scheduler = cls(processes, **params)
+        worker = RunWorker(self.cache, scheduler, params)
+        worker.progress.connect(lambda completed, total, w=worker: self.show_progress(w, completed, total))
+        worker.segments.connect(lambda chunk, w=worker: self.draw_progress(w, chunk))
+        worker.done.connect(lambda result, w=worker: self.run_finished(w, result))
+        worker.failed.connect(lambda message, w=worker: self.run_failed(w, message))
+        worker.finished.connect(lambda w=worker: self.workers.discard(w))
+        self.worker = worker
+        self.workers.add(worker)
+
+        self.start_progress_plot(scheduler)
+        self.progress_bar.setRange(0, len(processes))
+        self.progress_bar.setValue(0)
+        self.cancel_button.setEnabled(True)
+        worker.start()
+
+    def start_progress_plot(self, scheduler):
+        self.rows = np.unique(scheduler.processes.process_id)
+        self.progress_ax = None
+        if len(self.rows) > scheduler.max_rows:
+            return
+        fig, ax = scheduler.create_plot('Scheduling Visualization (running)')
+        ax.set_ylim(0, len(self.rows))
+        ax.set_yticks(np.arange(len(self.rows)) + 0.5)
+        ax.set_yticklabels([f'P{pid}' for pid in self.rows.tolist()])
+        self.progress_ax = ax
+        self.canvas.figure = fig
+        self.canvas.draw_idle()
+
+    def show_progress(self, worker, completed, total):
+        if worker is self.worker:
+            self.progress_bar.setValue(completed)
+
+    def draw_progress(self, worker, chunk):
+        if worker is not self.worker or self.progress_ax is None:
+            return
+        starts, ends, pids, slots = chunk
+        y_positions = np.searchsorted(self.rows, pids)
+        colors = default_colormap()(slots / max(worker.scheduler.num_processes, 1))
+        for row in np.unique(y_positions).tolist():
+            members = y_positions == row
+            self.progress_ax.broken_barh(np.column_stack((starts[members], ends[members] - starts[members])), (row, 1), facecolors=colors[members])
+        self.progress_ax.autoscale_view(scalex=True, scaley=False)
+        self.canvas.draw_idle()
+
+    def run_finished(self, worker, scheduler):
+        if worker is not self.worker:
+            return
+        self.worker = None
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.setValue(self.progress_bar.maximum())
         self.visualize(scheduler)
         self.table(scheduler)
+
+    def run_failed(self, worker, message):
+        if worker is not self.worker:
+            return
+        self.worker = None
+        self.cancel_button.setEnabled(False)
+        self.show_error_message(message)
+
+    def cancel_run(self):
+        if self.worker is not None:
+            self.worker.cancel()
+            self.worker = None
+        self.cancel_button.setEnabled(False)
+        self.progress_bar.setValue(0)
+
+    def closeEvent(self, event):
+        for worker in list(self.workers):
+            worker.cancel()
+            worker.wait()
+        super().closeEvent(event)
         
     def visualize(self, scheduler):
         self.figure.clear()
-        fig = scheduler.visualize()
+        # Rendering dominates a repeated run once the result is cached, so
+        # keep the last few figures around under the same key.
+        fig = self.figures.pop(scheduler.cache_key, None)
+        if fig is None:
+            fig = scheduler.visualize()
+        self.figures[scheduler.cache_key] = fig
+        while len(self.figures) > self.max_figures:
+            self.figures.popitem(last=False)
         self.canvas.figure = fig
         self.canvas.draw()
         self.canvas.figure.tight_layout()
 
     def table(self, scheduler):
-        self.results_table.clearContents()
-        self.results_table.setRowCount(0)
-        
-        self.results_table.setRowCount(len(scheduler.processes) + 1)
-        header_labels = ["Process", "Arrival Time", "Burst Time", "Turnaround Time", "Waiting Time", "Completion Time"]
-            
-        if isinstance(scheduler, Priority) or isinstance(scheduler, Priority_pre):
-            header_labels.insert(3, "Priority")
-            self.results_table.setColumnCount(7)
-                
-        self.results_table.setHorizontalHeaderLabels(header_labels)
-            
-        for i, process in enumerate(scheduler.processes):
-            self.results_table.setItem(i, 0, QTableWidgetItem(str(process['process_id'])))
-            self.results_table.setItem(i, 1, QTableWidgetItem(str(process['arrival_time'])))
-            self.results_table.setItem(i, 2, QTableWidgetItem(str(process['burst_time'])))
-            
-            if isinstance(scheduler, Priority) or isinstance(scheduler, Priority_pre):
-                self.results_table.setItem(i, 3, QTableWidgetItem(str(process['priority'])))
-                col_offset = 1
-            else:
-                col_offset = 0
-            
-            self.results_table.setItem(i, 3 + col_offset, QTableWidgetItem(str(scheduler.turnaround_times[i])))
-            self.results_table.setItem(i, 4 + col_offset, QTableWidgetItem(str(scheduler.waiting_times[i])))
-            self.results_table.setItem(i, 5 + col_offset, QTableWidgetItem(str(scheduler.completion_times[i])))
-            
-        avg_turnaround = sum(scheduler.turnaround_times) / len(scheduler.processes)
-        avg_waiting = sum(scheduler.waiting_times) / len(scheduler.processes)
-            
-        self.results_table.setItem(len(scheduler.processes), 0, QTableWidgetItem("Average:"))
-        self.results_table.setItem(len(scheduler.processes), 4 + col_offset, QTableWidgetItem(str(avg_waiting)))
-        self.results_table.setItem(len(scheduler.processes), 3 + col_offset, QTableWidgetItem(str(avg_turnaround)))
+        self.results_model.set_scheduler(scheduler, isinstance(scheduler, Priority) or isinstance(scheduler, Priority_pre))
+        self.export_results_button.setEnabled(True)
 
     def clear_processes(self):
-        self.process_table.clearContents()
+        self.process_model.clear()
 
     def show_error_message(self, message):
         msg = QMessageBox()
@@ -0,0 +1,79 @@
+from array import array
+import numpy as np
+
+def default_colormap():
+    import matplotlib
+    return matplotlib.colormaps['tab10']
+
+class GanttChart:
+    __slots__ = ('_start', '_end', '_pid', '_slot', 'num_processes')
+
+    def __init__(self, num_processes=0):
+        self._start = array('d')
+        self._end = array('d')
+        self._pid = array('q')
+        self._slot = array('q')
+        self.num_processes = num_processes
+
+    @classmethod
+    def from_arrays(cls, starts, ends, pids, slots, num_processes=0):
+        chart = cls(num_processes)
+        chart._start.frombytes(np.ascontiguousarray(starts, dtype=np.float64).tobytes())
+        chart._end.frombytes(np.ascontiguousarray(ends, dtype=np.float64).tobytes())
+        chart._pid.frombytes(np.ascontiguousarray(pids, dtype=np.int64).tobytes())
+        chart._slot.frombytes(np.ascontiguousarray(slots, dtype=np.int64).tobytes())
+        return chart
+
+    def __len__(self):
+        return len(self._pid)
+
+    def __bool__(self):
+        return len(self._pid) > 0
+
+    def append(self, start, end, pid, slot):
+        if self._pid and self._pid[-1] == pid and self._end[-1] == start:
+            self._end[-1] = end
+            return
+        self._start.append(start)
+        self._end.append(end)
+        self._pid.append(pid)
+        self._slot.append(slot)
+
+    @property
+    def starts(self):
+        return np.array(self._start, dtype=np.float64)
+
+    @property
+    def ends(self):
+        return np.array(self._end, dtype=np.float64)
+
+    @property
+    def pids(self):
+        return np.array(self._pid, dtype=np.int64)
+
+    @property
+    def slots(self):
+        return np.array(self._slot, dtype=np.int64)
+
+    def tail(self, first):
+        # Segments from `first` on, except the newest, which append may still extend.
+        last = max(first, len(self._start) - 1)
+        return (np.array(self._start[first:last]), np.array(self._end[first:last]),
+                np.array(self._pid[first:last], dtype=np.int64), np.array(self._slot[first:last], dtype=np.int64))
+
+    def segments(self):
+        return zip(self._start, self._end, self._pid)
+
+    def colors(self, colormap=None):
+        return (colormap or default_colormap())(self.slots / max(self.num_processes, 1))
+
+    def color_of(self, slot, colormap=None):
+        return (colormap or default_colormap())(slot / max(self.num_processes, 1))
+
+    def __getitem__(self, i):
+        return (self._start[i], self._end[i], self._pid[i], self.color_of(self._slot[i]))
+
+    def __iter__(self):
+        colormap = default_colormap()
+        for start, end, pid, slot in zip(self._start, self._end, self._pid, self._slot):
+            yield start, end, pid, self.color_of(slot, colormap)
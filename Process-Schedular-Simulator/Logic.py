@@ -1,39 +1,491 @@
+import bisect
+import heapq
+import math
+import time
+from collections import deque
 import numpy as np
-import matplotlib as plt
-from matplotlib.figure import Figure
-colormap = plt.colormaps['tab10']
+from Workload import Workload
+from Gantt import GanttChart, default_colormap
+from Stats import SchedulerStats
+
+# matplotlib is only imported once a chart is actually drawn, so headless
+# callers can use the schedulers without paying for it.
+def __getattr__(name):
+    if name == 'colormap':
+        return default_colormap()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Fractional times only add up to within an ulp of the clock, so the
+# preemptive engines compare them with a tolerance of EPSILON * (1 + |time|).
+# Exact tests leave a job alive on a ~1e-16 leftover or slip a sliver of
+# another job in just before an arrival.
+EPSILON = 1e-9
+
+class ReadyQueue:
+    def __init__(self, key):
+        self.key = key
+        self.heap = []
+
+    def __len__(self):
+        return len(self.heap)
+
+    def push(self, index, current_time):
+        heapq.heappush(self.heap, (self.key(index), index))
+
+    def pop(self, current_time):
+        return heapq.heappop(self.heap)[1]
+
+class ResponseRatioQueue:
+    # Kinetic tournament over the response ratios (t - arrival) / burst.
+    # Every node keeps the winner of its subtree and a certificate telling
+    # until when that winner is guaranteed to stay ahead, so advancing time
+    # only revisits the matches whose order can actually have changed.
+    def __init__(self, arrival_time, burst_time):
+        self.arrival_time = arrival_time
+        self.burst_time = burst_time
+        self.size = 0
+        self.winner = []
+        self.certificate = []
+        self.free_slots = []
+        self.slot_of = {}
+        self.grow()
+
+    def __len__(self):
+        return len(self.slot_of)
+
+    def grow(self):
+        # Leaves are slots handed out to ready jobs, so the tree stays as
+        # deep as the ready set needs rather than the whole workload.
+        old_size = self.size
+        leaves = self.winner[old_size:]
+        self.size = max(1, 2 * old_size)
+        self.winner = [-1] * self.size + leaves + [-1] * (self.size - old_size)
+        self.certificate = [(-math.inf, 0)] * self.size + [(math.inf, 1)] * self.size
+        self.free_slots.extend(range(self.size - 1, old_size - 1, -1))
+
+    def push(self, index, current_time):
+        if not self.free_slots:
+            self.grow()
+        slot = self.free_slots.pop()
+        self.slot_of[index] = slot
+        self.winner[self.size + slot] = index
+        self.invalidate(self.size + slot)
+
+    def pop(self, current_time):
+        self.advance(1, current_time)
+        index = self.winner[1]
+        slot = self.slot_of.pop(index)
+        self.free_slots.append(slot)
+        self.winner[self.size + slot] = -1
+        self.invalidate(self.size + slot)
+        return index
+
+    def invalidate(self, node):
+        node //= 2
+        while node and self.certificate[node] != (-math.inf, 0):
+            self.certificate[node] = (-math.inf, 0)
+            node //= 2
+
+    def advance(self, node, current_time):
+        now = (current_time, 0)
+        if self.certificate[node] > now:
+            return
+        left, right = 2 * node, 2 * node + 1
+        if self.certificate[left] <= now:
+            self.advance(left, current_time)
+        if self.certificate[right] <= now:
+            self.advance(right, current_time)
+        first, second = self.winner[left], self.winner[right]
+        certificate = min(self.certificate[left], self.certificate[right])
+
+        if first == -1 or second == -1:
+            self.winner[node] = first if second == -1 else second
+        else:
+            if not self.beats(first, second, current_time):
+                first, second = second, first
+            self.winner[node] = first
+            certificate = min(certificate, self.expiry(first, second))
+        self.certificate[node] = certificate
+
+    def beats(self, i, j, current_time):
+        burst_i, burst_j = self.burst_time[i], self.burst_time[j]
+        if burst_i == 0 or burst_j == 0:
+            return burst_i == 0 and (burst_j != 0 or i < j)
+        ratio_i = (current_time - self.arrival_time[i]) * burst_j
+        ratio_j = (current_time - self.arrival_time[j]) * burst_i
+        if ratio_i != ratio_j:
+            return ratio_i > ratio_j
+        return i < j
+
+    def expiry(self, winner, loser):
+        burst_w, burst_l = self.burst_time[winner], self.burst_time[loser]
+        if burst_w == 0 or burst_l >= burst_w:
+            return (math.inf, 1)
+        crossing = (self.arrival_time[winner] * burst_l - self.arrival_time[loser] * burst_w) / (burst_l - burst_w)
+        return (crossing, 1 if winner < loser else 0)
+
+class LevelQueue:
+    # A FIFO kept as a chain of deques so a whole queue can be appended to
+    # another in O(1), which is what an MLFQ priority boost needs.
+    def __init__(self):
+        self.segments = deque()
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    def append(self, index):
+        if not self.segments:
+            self.segments.append(deque())
+        self.segments[-1].append(index)
+        self.count += 1
+
+    def appendleft(self, index):
+        if not self.segments:
+            self.segments.append(deque())
+        self.segments[0].appendleft(index)
+        self.count += 1
+
+    def popleft(self):
+        while not self.segments[0]:
+            self.segments.popleft()
+        self.count -= 1
+        return self.segments[0].popleft()
+
+    def merge(self, other):
+        self.segments.extend(other.segments)
+        self.count += other.count
+        other.segments = deque()
+        other.count = 0
+
+class StreamState:
+    # Online counterpart of run(): holds only the ready set and advances the
+    # clock as arrivals are offered, returning events as they happen.
+    def __init__(self, policy):
+        if policy.stream_key is None:
+            supported = [name for name, algorithm in ALGORITHMS.items() if algorithm.stream_key is not None]
+            raise TypeError(f"{policy.__name__} has no streaming mode, only {', '.join(supported)} can stream.")
+        self.key = policy.stream_key
+        self.preemptive = policy.stream_preemptive
+        self.ready = []
+        self.current_time = 0
+        self.last_arrival = -math.inf
+        self.running = None
+        self.count = 0
+
+    def run(self, arrivals):
+        for record in arrivals:
+            yield from self.advance(record["arrival_time"])
+            self.add(record)
+        yield from self.advance(math.inf)
+
+    async def arun(self, arrivals):
+        async for record in arrivals:
+            for event in self.advance(record["arrival_time"]):
+                yield event
+            self.add(record)
+        for event in self.advance(math.inf):
+            yield event
+
+    def add(self, record):
+        record = dict(record)
+        record.setdefault("process_id", self.count + 1)
+        record.setdefault("priority", 0)
+        if record["arrival_time"] < self.last_arrival:
+            raise ValueError("Arrivals must be sorted by arrival_time.")
+        self.last_arrival = record["arrival_time"]
+        if not self.ready:
+            self.current_time = max(self.current_time, record["arrival_time"])
+        heapq.heappush(self.ready, (self.key(record, record["burst_time"]), self.count, record, record["burst_time"]))
+        self.count += 1
+
+    def advance(self, until):
+        events = []
+        while self.ready and self.current_time < until:
+            _, seq, record, remaining = heapq.heappop(self.ready)
+            if self.running != seq:
+                self.running = seq
+                events.append(("dispatch", self.current_time, record["process_id"]))
+
+            run_time = remaining
+            if self.preemptive:
+                run_time = min(remaining, until - self.current_time)
+            self.current_time += run_time
+
+            if run_time == remaining:
+                self.running = None
+                events.append(("complete", self.current_time, self.completion(record)))
+            else:
+                remaining -= run_time
+                heapq.heappush(self.ready, (self.key(record, remaining), seq, record, remaining))
+        return events
+
+    def completion(self, record):
+        turnaround_time = self.current_time - record["arrival_time"]
+        return dict(record, completion_time=self.current_time, turnaround_time=turnaround_time, waiting_time=turnaround_time - record["burst_time"])
 
 class Scheduler:
+    max_segments = 20000
+    raster_segments = 200000
+    raster_width = 4000
+    max_rows = 500
+    max_labels = 200
+    min_label_width = 0.01
+    max_unit_ticks = 40
+    stream_key = None
+    stream_preemptive = False
+    stats = None
+
     def __init__(self, processes):
-        self.processes = processes
-        self.num_processes = len(processes)
-        self.turnaround_times = [0] * self.num_processes
-        self.waiting_times = [0] * self.num_processes
-        self.completion_times = [0] * self.num_processes
+        self.processes = Workload.coerce(processes)
+        self.num_processes = len(self.processes)
+        self.turnaround_times = np.zeros(self.num_processes)
+        self.waiting_times = np.zeros(self.num_processes)
+        self.completion_times = np.zeros(self.num_processes)
         self.current_time = 0
-        self.completed = [False] * self.num_processes
-        self.gantt_chart = []
+        self.completed = np.zeros(self.num_processes, dtype=bool)
+        self.gantt_chart = GanttChart(self.num_processes)
+        self.order = None
 
     def run(self):
         pass
+
+    def profile(self, timing=False):
+        self.stats = SchedulerStats(timing)
+        start = time.perf_counter()
+        self.run()
+        self.stats.run_seconds = time.perf_counter() - start
+        return self.stats
+
+    # Not generators themselves, so a policy without a streaming mode fails
+    # on the call and not on the first event.
+    @classmethod
+    def stream(cls, arrivals):
+        return StreamState(cls).run(arrivals)
+
+    @classmethod
+    def astream(cls, arrivals):
+        return StreamState(cls).arun(arrivals)
+
+    def reorder(self, order):
+        self.order = order if self.order is None else self.order[order]
+        self.processes = self.processes.take(order)
+
+    def cache_state(self):
+        state = {
+            "completion_times": self.completion_times,
+            "turnaround_times": self.turnaround_times,
+            "waiting_times": self.waiting_times,
+            "gantt_start": self.gantt_chart.starts,
+            "gantt_end": self.gantt_chart.ends,
+            "gantt_pid": self.gantt_chart.pids,
+            "gantt_slot": self.gantt_chart.slots,
+        }
+        if self.order is not None:
+            state["order"] = np.asarray(self.order, dtype=np.int64)
+        return state
+
+    def restore_state(self, state):
+        # The result arrays are the cache's read-only ones, shared by every hit.
+        if "order" in state:
+            self.reorder(state["order"])
+        self.completion_times = state["completion_times"]
+        self.turnaround_times = state["turnaround_times"]
+        self.waiting_times = state["waiting_times"]
+        self.gantt_chart = GanttChart.from_arrays(state["gantt_start"], state["gantt_end"], state["gantt_pid"], state["gantt_slot"], self.num_processes)
+        self.completed[:] = True
+
+    def record_completions(self, completion_times):
+        self.completion_times = np.asarray(completion_times, dtype=np.float64)
+        self.turnaround_times = self.completion_times - self.processes.arrival_time
+        self.waiting_times = self.turnaround_times - self.processes.burst_time
+        self.completed[:] = True
+
+    def summary(self):
+        if not self.num_processes:
+            return {"average_turnaround": 0.0, "average_waiting": 0.0, "makespan": 0.0, "throughput": 0.0}
+        makespan = float(self.completion_times.max() - self.processes.arrival_time.min())
+        return {
+            "average_turnaround": float(self.turnaround_times.mean()),
+            "average_waiting": float(self.waiting_times.mean()),
+            "makespan": makespan,
+            "throughput": self.num_processes / makespan if makespan > 0 else 0.0,
+        }
+
+    def add_slice(self, start, end, index):
+        self.gantt_chart.append(start, end, int(self.processes.process_id[index]), index)
+
+    def run_non_preemptive(self, ready_queue):
+        arrival_time = self.processes.arrival_time.tolist()
+        burst_time = self.processes.burst_time.tolist()
+        order = np.argsort(self.processes.arrival_time, kind='stable').tolist()
+        completion_times = [0.0] * self.num_processes
+        stats = self.stats
+        next_index = 0
+
+        while next_index < self.num_processes or len(ready_queue):
+            if not len(ready_queue):
+                self.current_time = max(self.current_time, arrival_time[order[next_index]])
+
+            # A job finishing an ulp before an arrival still sees it arrive.
+            arrived = self.current_time + EPSILON * (1.0 + abs(self.current_time))
+            while next_index < self.num_processes and arrival_time[order[next_index]] <= arrived:
+                ready_queue.push(order[next_index], self.current_time)
+                next_index += 1
+
+            if stats is None:
+                current = ready_queue.pop(self.current_time)
+            else:
+                current = stats.select(len(ready_queue), ready_queue.pop, self.current_time)
+                stats.running(current)
+                stats.completed()
+            start_time = self.current_time
+            self.current_time += burst_time[current]
+            completion_times[current] = self.current_time
+            self.add_slice(start_time, self.current_time, current)
+
+        self.record_completions(completion_times)
+
+    def run_remaining_time(self, longest=False):
+        arrival_time = self.processes.arrival_time.tolist()
+        remaining_burst_time = self.processes.burst_time.tolist()
+        order = np.argsort(self.processes.arrival_time, kind='stable').tolist()
+        completion_times = [0.0] * self.num_processes
+        sign = -1 if longest else 1
+        stats = self.stats
+        ready = []
+        next_index = 0
+
+        while next_index < self.num_processes or ready:
+            if not ready:
+                self.current_time = max(self.current_time, arrival_time[order[next_index]])
+
+            while next_index < self.num_processes and arrival_time[order[next_index]] <= self.current_time:
+                i = order[next_index]
+                heapq.heappush(ready, (sign * remaining_burst_time[i], i))
+                next_index += 1
+
+            if stats is None:
+                _, current = heapq.heappop(ready)
+            else:
+                _, current = stats.select(len(ready), heapq.heappop, ready)
+                stats.running(current)
+            run_time = remaining_burst_time[current]
+
+            # LRTF re-selects every time unit, so a job only keeps the CPU
+            # until it drops to the next longest one and ties alternate.
+            if longest and ready:
+                runner_up_time, runner_up = -ready[0][0], ready[0][1]
+                if current < runner_up:
+                    ticks = math.floor(run_time - runner_up_time) + 1
+                else:
+                    ticks = math.ceil(run_time - runner_up_time)
+                run_time = min(run_time, ticks)
+
+            # Cut at the next arrival by absolute time, so the clock lands on it.
+            end_time = self.current_time + run_time
+            tolerance = EPSILON * (1.0 + abs(end_time))
+            if next_index < self.num_processes and arrival_time[order[next_index]] - end_time <= tolerance:
+                end_time = arrival_time[order[next_index]]
+                run_time = end_time - self.current_time
+
+            start_time = self.current_time
+            self.current_time = end_time
+            if run_time > 0:
+                self.add_slice(start_time, self.current_time, current)
+
+            if remaining_burst_time[current] - run_time <= tolerance:
+                remaining_burst_time[current] = 0
+                completion_times[current] = self.current_time
+                if stats is not None:
+                    stats.completed()
+            else:
+                remaining_burst_time[current] -= run_time
+                heapq.heappush(ready, (sign * remaining_burst_time[current], current))
+
+        self.record_completions(completion_times)
     
-    def visualize(self):
+    def visualize(self, max_segments=None, raster_segments=None):
+        max_segments = self.max_segments if max_segments is None else max_segments
+        raster_segments = self.raster_segments if raster_segments is None else raster_segments
         fig, ax = self.create_plot('Scheduling Visualization')
-        pid_to_y = {pid: i for i, pid in enumerate(sorted(set(pid for start, end, pid, color in self.gantt_chart)))}
-        
-        for start, end, pid, color in self.gantt_chart:
-            y_position = pid_to_y[pid]
-            ax.broken_barh([(start, end - start)], (y_position, 1), facecolors=color)
-            
-            text_x = start + (end - start) / 2
-            text_y = y_position + 0.5
-            ax.text(text_x, text_y, 'P' + str(pid), ha='center', va='center', color='white', fontsize=10)
-        
+        starts, ends = self.gantt_chart.starts, self.gantt_chart.ends
+        rows, y_positions = np.unique(self.gantt_chart.pids, return_inverse=True)
+        slots = self.gantt_chart.slots
+
+        bars = self.fit_segments(starts, ends, y_positions, slots, len(rows), max_segments, raster_segments)
+        if bars is None:
+            self.draw_raster(ax, starts, ends, y_positions, slots, len(rows))
+        else:
+            self.draw_segments(ax, *bars, rows)
+
         ax.set_yticks([])
         self.finish_plot(ax)
         return fig
 
+    def draw_segments(self, ax, starts, ends, y_positions, slots, rows):
+        colors = default_colormap()(slots / max(self.num_processes, 1))
+        widths = ends - starts
+        order = np.argsort(y_positions, kind='stable')
+        bounds = np.searchsorted(y_positions[order], np.arange(len(rows) + 1))
+
+        for row in range(len(rows)):
+            members = order[bounds[row]:bounds[row + 1]]
+            ax.broken_barh(np.column_stack((starts[members], widths[members])), (row, 1), facecolors=colors[members])
+
+        span = ends.max(initial=0) - starts.min(initial=0)
+        labeled = np.flatnonzero(widths >= self.min_label_width * span)
+        if len(labeled) > self.max_labels:
+            labeled = labeled[np.argsort(-widths[labeled], kind='stable')[:self.max_labels]]
+        for i in labeled.tolist():
+            text_x = starts[i] + widths[i] / 2
+            text_y = y_positions[i] + 0.5
+            ax.text(text_x, text_y, 'P' + str(rows[y_positions[i]]), ha='center', va='center', color='white', fontsize=10)
+
+    def fit_segments(self, starts, ends, y_positions, slots, num_rows, max_segments, raster_segments):
+        # The bars to draw as vectors, at most max_segments of them, or None
+        # when the chart has to be a raster. Interleaved rows have gaps wider
+        # than a pixel and barely merge, so downsampling alone may not do.
+        if len(starts) > raster_segments or num_rows > self.max_rows:
+            return None
+        if len(starts) > max_segments:
+            starts, ends, y_positions, slots = self.downsample(starts, ends, y_positions, slots)
+        if len(starts) > max_segments:
+            return None
+        return starts, ends, y_positions, slots
+
+    def downsample(self, starts, ends, y_positions, slots):
+        # Merge neighbouring bars of a row that would land in the same pixel
+        # column, keeping the color of the first one.
+        resolution = (ends.max() - starts.min()) / self.raster_width
+        order = np.lexsort((starts, y_positions))
+        starts, ends, y_positions, slots = starts[order], ends[order], y_positions[order], slots[order]
+        new_group = np.ones(len(starts), dtype=bool)
+        new_group[1:] = (y_positions[1:] != y_positions[:-1]) | (starts[1:] - ends[:-1] > resolution)
+        first = np.flatnonzero(new_group)
+        return starts[first], np.maximum.reduceat(ends, first), y_positions[first], slots[first]
+
+    def draw_raster(self, ax, starts, ends, y_positions, slots, num_rows):
+        height = min(num_rows, self.max_rows)
+        x_min, x_max = starts.min(), ends.max()
+        resolution = (x_max - x_min) / self.raster_width or 1
+        first_pixel = ((starts - x_min) / resolution).astype(np.int64)
+        last_pixel = np.maximum(np.ceil((ends - x_min) / resolution).astype(np.int64), first_pixel + 1)
+        last_pixel = np.minimum(last_pixel, self.raster_width)
+        first_pixel = np.minimum(first_pixel, last_pixel - 1)
+        image_rows = y_positions * height // num_rows
+
+        lengths = last_pixel - first_pixel
+        segment = np.repeat(np.arange(len(starts)), lengths)
+        pixel = np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths) + first_pixel[segment]
+        image = np.full((height, self.raster_width), np.nan)
+        image[image_rows[segment], pixel] = slots[segment] / max(self.num_processes, 1)
+
+        ax.imshow(np.ma.masked_invalid(image), cmap=default_colormap(), vmin=0, vmax=1, aspect='auto', origin='lower',
+                  interpolation='nearest', extent=(x_min, x_min + resolution * self.raster_width, 0, num_rows))
+
     def create_plot(self, title):
+        from matplotlib.figure import Figure
         fig = Figure(figsize=(20, 6))
         ax = fig.add_subplot(111)
         ax.set_xlabel('Time')
@@ -42,236 +494,314 @@ class Scheduler:
         return fig, ax
 
     def finish_plot(self, ax):
-        ax.set_xticks(np.arange(0, max(self.completion_times, default=0) + 1, 1))
+        from matplotlib.ticker import MaxNLocator
+        makespan = self.completion_times.max(initial=0)
+        if makespan <= self.max_unit_ticks:
+            ax.set_xticks(np.arange(0, makespan + 1, 1))
+        else:
+            ax.xaxis.set_major_locator(MaxNLocator(nbins=20, integer=True))
         ax.grid(True, which='both', axis='x', color='gray', linestyle='-', linewidth=0.5, alpha=0.5)
             
 class FCFS(Scheduler):
-    def run(self):
-        self.processes.sort(key=lambda x: x["arrival_time"])
-
-        for i, process in enumerate(self.processes):
-            if i == 0:
-                self.waiting_times[i] = 0
-                self.current_time = process["arrival_time"]
-            else:
-                if self.current_time < process["arrival_time"]:
-                    self.current_time = process["arrival_time"]
+    @staticmethod
+    def stream_key(record, remaining):
+        return record["arrival_time"]
 
-                self.waiting_times[i] = self.current_time - process["arrival_time"]
+    def run(self):
+        self.reorder(np.argsort(self.processes.arrival_time, kind='stable'))
+        arrival_time = self.processes.arrival_time.tolist()
+        burst_time = self.processes.burst_time.tolist()
+        completion_times = [0.0] * self.num_processes
+        stats = self.stats
+
+        for i in range(self.num_processes):
+            if i == 0 or self.current_time < arrival_time[i]:
+                self.current_time = arrival_time[i]
+            if stats is not None:
+                # Arrivals are sorted, so the ready set is every arrived job
+                # from i on and the pick is always its head.
+                ready_length = bisect.bisect_right(arrival_time, self.current_time, i) - i
+                stats.select(ready_length, lambda: i)
+                stats.running(i)
+                stats.completed()
 
             start_time = self.current_time
-            self.current_time += process["burst_time"]
-            self.completion_times[i] = self.current_time
-            self.turnaround_times[i] = self.completion_times[i] - process["arrival_time"]
-            self.gantt_chart.append((start_time, self.current_time, process['process_id'], colormap(i / self.num_processes)))
+            self.current_time += burst_time[i]
+            completion_times[i] = self.current_time
+            self.add_slice(start_time, self.current_time, i)
+
+        self.record_completions(completion_times)
 
 class Priority(Scheduler):
+    @staticmethod
+    def stream_key(record, remaining):
+        return (record["priority"], record["arrival_time"])
+
     def run(self):
-        self.processes.sort(key=lambda x: (x["priority"], x["arrival_time"]))
-        
-        while any(not self.completed[i] for i in range(self.num_processes)):
-            next_process = next((i for i in range(self.num_processes) if not self.completed[i] and self.processes[i]["arrival_time"] <= self.current_time), -1)
-            
-            if next_process == -1:
-                min_arrival_time = min((proc["arrival_time"] for i, proc in enumerate(self.processes) if not self.completed[i]), default=self.current_time)
-                self.current_time = min_arrival_time
-                continue
-            
-            next_process = min((i for i in range(self.num_processes) if not self.completed[i] and self.processes[i]["arrival_time"] <= self.current_time), key=lambda i: self.processes[i]["priority"])
-            start_time = self.current_time
-            
-            self.current_time += self.processes[next_process]["burst_time"]
-            self.completion_times[next_process] = self.current_time
-            self.completed[next_process] = True
-            self.turnaround_times[next_process] = self.current_time - self.processes[next_process]["arrival_time"]
-            self.waiting_times[next_process] = self.turnaround_times[next_process] - self.processes[next_process]["burst_time"]
-            self.gantt_chart.append((start_time, self.current_time, self.processes[next_process]['process_id'], colormap(next_process / self.num_processes)))
+        self.reorder(np.lexsort((self.processes.arrival_time, self.processes.priority)))
+        self.run_non_preemptive(ReadyQueue(key=lambda i: i))
                     
 class Priority_pre(Scheduler):
+    stream_preemptive = True
+
+    @staticmethod
+    def stream_key(record, remaining):
+        return (record["priority"], record["arrival_time"])
+
     def run(self):
-        self.processes.sort(key=lambda x: (x["priority"], x["arrival_time"]))
-        remaining_burst_times = {i: proc["burst_time"] for i, proc in enumerate(self.processes)}
-        
-        while any(not self.completed[i] for i in range(self.num_processes)):
+        self.reorder(np.lexsort((self.processes.arrival_time, self.processes.priority)))
+        arrival_time = self.processes.arrival_time.tolist()
+        priority = self.processes.priority.tolist()
+        remaining_burst_times = self.processes.burst_time.tolist()
+        completion_times = [0.0] * self.num_processes
+        completed = [False] * self.num_processes
+        stats = self.stats
+
+        def pick():
             current_process = None
             for i in range(self.num_processes):
-                if not self.completed[i] and self.processes[i]["arrival_time"] <= self.current_time:
-                    if current_process is None or self.processes[i]["priority"] < self.processes[current_process]["priority"]:
+                if not completed[i] and arrival_time[i] <= self.current_time:
+                    if current_process is None or priority[i] < priority[current_process]:
                         current_process = i
+            return current_process
+
+        while not all(completed):
+            if stats is None:
+                current_process = pick()
+            else:
+                ready_length = sum(1 for i in range(self.num_processes) if not completed[i] and arrival_time[i] <= self.current_time)
+                current_process = stats.select(ready_length, pick) if ready_length else None
 
             if current_process is None:
-                self.current_time = min(proc["arrival_time"] for i, proc in enumerate(self.processes) if not self.completed[i])
+                self.current_time = min(arrival_time[i] for i in range(self.num_processes) if not completed[i])
                 continue
+            if stats is not None:
+                stats.running(current_process)
 
             start_time = self.current_time
-            next_arrival_time = min((proc["arrival_time"] for i, proc in enumerate(self.processes) if proc["arrival_time"] > self.current_time and not self.completed[i]), default=float('inf'))
-            execution_time = min(remaining_burst_times[current_process], next_arrival_time - self.current_time)
-
-            self.current_time += execution_time
+            next_arrival_time = min((arrival_time[i] for i in range(self.num_processes) if arrival_time[i] > self.current_time and not completed[i]), default=float('inf'))
+            end_time = self.current_time + remaining_burst_times[current_process]
+            tolerance = EPSILON * (1.0 + abs(end_time))
+            if next_arrival_time - end_time <= tolerance:
+                end_time = next_arrival_time
+            execution_time = end_time - self.current_time
+            done = remaining_burst_times[current_process] - execution_time <= tolerance
+
+            self.current_time = end_time
             remaining_burst_times[current_process] -= execution_time
 
-            if remaining_burst_times[current_process] == 0:
-                self.completed[current_process] = True
-                self.completion_times[current_process] = self.current_time
-                self.turnaround_times[current_process] = self.current_time - self.processes[current_process]["arrival_time"]
-                wait = self.turnaround_times[current_process] - self.processes[current_process]["burst_time"]
-                self.waiting_times[current_process] = max(wait, 0)
+            if done:
+                remaining_burst_times[current_process] = 0
+                completed[current_process] = True
+                completion_times[current_process] = self.current_time
+                if stats is not None:
+                    stats.completed()
 
-            color = colormap(current_process / self.num_processes)
-            self.gantt_chart.append((start_time, self.current_time, self.processes[current_process]['process_id'], color))
+            self.add_slice(start_time, self.current_time, current_process)
+
+        self.record_completions(completion_times)
+        self.waiting_times = np.maximum(self.waiting_times, 0)
             
 class HRRN(Scheduler):
     def run(self):
-        num_processes = len(self.processes)
-        remaining_burst_time = [p["burst_time"] for p in self.processes]
-        arrival_time = [p["arrival_time"] for p in self.processes]
-        completed = [False] * num_processes
-
-        while any(not comp for comp in completed):
-            next_process = -1
-            max_response_ratio = -1
-
-            for i in range(num_processes):
-                if not completed[i] and arrival_time[i] <= self.current_time:
-                    response_time = (self.current_time - arrival_time[i] + remaining_burst_time[i])
-                    response_ratio = response_time / remaining_burst_time[i]
-                    
-                    if response_ratio > max_response_ratio:
-                        max_response_ratio = response_ratio
-                        next_process = i
-
-            if next_process == -1:
-                next_times = [arrival_time[i] for i in range(num_processes) if not completed[i]]
-                self.current_time = min(next_times)
-            else:
-                self.waiting_times[next_process] = self.current_time - arrival_time[next_process]
-                start_time = self.current_time
-                self.current_time += remaining_burst_time[next_process]
-                self.turnaround_times[next_process] = self.current_time - arrival_time[next_process]
-                self.completion_times[next_process] = self.current_time
-                completed[next_process] = True
-                self.gantt_chart.append((start_time, self.current_time, self.processes[next_process]['process_id'], colormap(next_process / num_processes)))
+        arrival_time = self.processes.arrival_time.tolist()
+        burst_time = self.processes.burst_time.tolist()
+        self.run_non_preemptive(ResponseRatioQueue(arrival_time, burst_time))
 
 class LJF(Scheduler):
-    def run(self):
-        self.processes.sort(key=lambda x: x["burst_time"], reverse=True)
-        completed = [False] * self.num_processes
-
-        while any(not comp for comp in completed):
-            next_process = -1
+    @staticmethod
+    def stream_key(record, remaining):
+        return -record["burst_time"]
 
-            for i in range(self.num_processes):
-                if not completed[i] and self.processes[i]["arrival_time"] <= self.current_time:
-                    next_process = i
-                    break
+    def run(self):
+        self.reorder(np.argsort(-self.processes.burst_time, kind='stable'))
+        self.run_non_preemptive(ReadyQueue(key=lambda i: i))
 
-            if next_process == -1:
-                future_arrivals = [p["arrival_time"] for i, p in enumerate(self.processes) if not completed[i]]
-                self.current_time = min(future_arrivals)
-                continue
+class SJF(Scheduler):
+    @staticmethod
+    def stream_key(record, remaining):
+        return record["burst_time"]
 
-            start_time = self.current_time
-            self.current_time += self.processes[next_process]["burst_time"]
-            self.completion_times[next_process] = self.current_time
-            completed[next_process] = True
+    def run(self):
+        self.reorder(np.argsort(self.processes.burst_time, kind='stable'))
+        self.run_non_preemptive(ReadyQueue(key=lambda i: i))
+                
+class LRTF(Scheduler):
+    def run(self):
+        self.run_remaining_time(longest=True)
+                    
+class SRTF(Scheduler):
+    stream_preemptive = True
 
-            self.turnaround_times[next_process] = self.current_time - self.processes[next_process]["arrival_time"]
-            self.waiting_times[next_process] = self.turnaround_times[next_process] - self.processes[next_process]["burst_time"]
-            self.gantt_chart.append((start_time, self.current_time, self.processes[next_process]['process_id'], colormap(next_process / self.num_processes)))
+    @staticmethod
+    def stream_key(record, remaining):
+        return remaining
 
-class SJF(Scheduler):
     def run(self):
-        self.processes.sort(key=lambda x: x["burst_time"])
-        completed = [False] * self.num_processes
+        self.run_remaining_time(longest=False)
 
-        while any(not comp for comp in completed):
-            next_process = -1
-            min_burst_time = float('inf')
+class RoundRobin(Scheduler):
+    def __init__(self, processes, quantum=2):
+        super().__init__(processes)
+        if quantum <= 0:
+            raise ValueError("Time quantum must be greater than zero.")
+        self.quantum = quantum
 
-            for i in range(self.num_processes):
-                if not completed[i] and self.processes[i]["arrival_time"] <= self.current_time and self.processes[i]["burst_time"] < min_burst_time:
-                    next_process = i
-                    min_burst_time = self.processes[i]["burst_time"]
-
-            if next_process == -1:
-                future_arrivals = [p["arrival_time"] for i, p in enumerate(self.processes) if not completed[i]]
-                self.current_time = min(future_arrivals)
-            else:
-                start_time = self.current_time
-                self.current_time += self.processes[next_process]["burst_time"]
-                self.completion_times[next_process] = self.current_time
-                completed[next_process] = True
-
-                self.turnaround_times[next_process] = self.current_time - self.processes[next_process]["arrival_time"]
-                self.waiting_times[next_process] = self.turnaround_times[next_process] - self.processes[next_process]["burst_time"]
-                self.gantt_chart.append((start_time, self.current_time, self.processes[next_process]['process_id'], colormap(next_process / self.num_processes)))
-                
-class LRTF(Scheduler):
     def run(self):
-        num_processes = len(self.processes)
-        remaining_burst_time = [p["burst_time"] for p in self.processes]
-        completed = [False] * num_processes
-
-        while any(not comp for comp in completed):
-            next_process = -1
-            max_remaining_time = 0
-
-            for i in range(num_processes):
-                if not completed[i] and remaining_burst_time[i] > 0 and self.processes[i]["arrival_time"] <= self.current_time:
-                    if remaining_burst_time[i] > max_remaining_time:
-                        next_process = i
-                        max_remaining_time = remaining_burst_time[i]
-
-            if next_process == -1:
-                next_times = [p["arrival_time"] for i, p in enumerate(self.processes) if not completed[i] and p["arrival_time"] > self.current_time]
-                self.current_time = min(next_times) if next_times else self.current_time + 1
+        arrival_time = self.processes.arrival_time.tolist()
+        remaining_burst_time = self.processes.burst_time.tolist()
+        order = np.argsort(self.processes.arrival_time, kind='stable').tolist()
+        completion_times = [0.0] * self.num_processes
+        stats = self.stats
+        ready = deque()
+        next_index = 0
+
+        while next_index < self.num_processes or ready:
+            if not ready:
+                self.current_time = max(self.current_time, arrival_time[order[next_index]])
+                while next_index < self.num_processes and arrival_time[order[next_index]] <= self.current_time:
+                    ready.append(order[next_index])
+                    next_index += 1
+
+            if stats is None:
+                current = ready.popleft()
             else:
-                start_time = self.current_time
-                self.current_time += 1
-                remaining_burst_time[next_process] -= 1
+                current = stats.select(len(ready), ready.popleft)
+                stats.running(current)
+            run_time = min(self.quantum, remaining_burst_time[current])
+            # A job alone in the queue keeps getting the CPU back at every
+            # quantum boundary, so run it straight up to the boundary where
+            # the next arrival will be waiting.
+            if not ready:
+                if next_index < self.num_processes:
+                    quanta = max(1, math.ceil((arrival_time[order[next_index]] - self.current_time) / self.quantum - EPSILON))
+                    run_time = min(quanta * self.quantum, remaining_burst_time[current])
+                else:
+                    run_time = remaining_burst_time[current]
 
-                for i in range(num_processes):
-                    if i != next_process and not completed[i] and self.processes[i]["arrival_time"] <= self.current_time - 1:
-                        self.waiting_times[i] += 1
-
-                self.gantt_chart.append((start_time, self.current_time, self.processes[next_process]['process_id'], colormap(next_process / num_processes)))
+            start_time = self.current_time
+            self.current_time += run_time
+            if run_time > 0:
+                self.add_slice(start_time, self.current_time, current)
+
+            tolerance = EPSILON * (1.0 + abs(self.current_time))
+            while next_index < self.num_processes and arrival_time[order[next_index]] - self.current_time <= tolerance:
+                ready.append(order[next_index])
+                next_index += 1
+
+            if remaining_burst_time[current] - run_time <= tolerance:
+                completion_times[current] = self.current_time
+                if stats is not None:
+                    stats.completed()
+            else:
+                remaining_burst_time[current] -= run_time
+                ready.append(current)
+
+        self.record_completions(completion_times)
+
+class MLFQ(Scheduler):
+    def __init__(self, processes, levels=3, quanta=None, boost_interval=None):
+        super().__init__(processes)
+        quanta = [2 * 2 ** level for level in range(levels)] if quanta is None else list(quanta)
+        if len(quanta) != levels:
+            raise ValueError("MLFQ needs one time quantum per level.")
+        if any(quantum <= 0 for quantum in quanta):
+            raise ValueError("Time quanta must be greater than zero.")
+        if boost_interval is not None and boost_interval <= 0:
+            raise ValueError("Boost interval must be greater than zero.")
+        self.levels = levels
+        self.quanta = quanta
+        self.boost_interval = boost_interval
 
-                if remaining_burst_time[next_process] == 0:
-                    self.completion_times[next_process] = self.current_time
-                    completed[next_process] = True
-                    self.turnaround_times[next_process] = self.current_time - self.processes[next_process]["arrival_time"]
-                    
-class SRTF(Scheduler):
     def run(self):
-        num_processes = len(self.processes)
-        remaining_burst_time = [p["burst_time"] for p in self.processes]
-        completed = [False] * num_processes
-
-        while any(not comp for comp in completed):
-            next_process = -1
-            min_remaining_time = float('inf')
-
-            for i in range(num_processes):
-                if not completed[i] and remaining_burst_time[i] > 0 and self.processes[i]["arrival_time"] <= self.current_time and remaining_burst_time[i] < min_remaining_time:
-                    next_process = i
-                    min_remaining_time = remaining_burst_time[i]
-
-            if next_process == -1:
-                future_arrivals = [p["arrival_time"] for i, p in enumerate(self.processes) if not completed[i]]
-                self.current_time = min(future_arrivals)
+        arrival_time = self.processes.arrival_time.tolist()
+        remaining_burst_time = self.processes.burst_time.tolist()
+        order = np.argsort(self.processes.arrival_time, kind='stable').tolist()
+        completion_times = [0.0] * self.num_processes
+        allotment = [0.0] * self.num_processes
+        boosted_at = [0] * self.num_processes
+        queues = [LevelQueue() for _ in range(self.levels)]
+        stats = self.stats
+        boosts = 0
+        next_index = 0
+        next_boost = math.inf
+
+        while next_index < self.num_processes or any(queues):
+            if not any(queues):
+                self.current_time = max(self.current_time, arrival_time[order[next_index]])
+            next_index = self.admit(queues[0], order, arrival_time, next_index)
+
+            if self.boost_interval is not None:
+                if self.current_time >= next_boost:
+                    # Every queue moves up in one step; allotments are reset
+                    # lazily by comparing each job's boost stamp.
+                    for queue in queues[1:]:
+                        queues[0].merge(queue)
+                    boosts += 1
+                next_boost = (math.floor(self.current_time / self.boost_interval) + 1) * self.boost_interval
+
+            level = next(l for l, queue in enumerate(queues) if queue)
+            if stats is None:
+                current = queues[level].popleft()
             else:
-                start_time = self.current_time
-                self.current_time += 1
-                remaining_burst_time[next_process] -= 1
+                current = stats.select(sum(len(queue) for queue in queues), queues[level].popleft)
+                stats.running(current)
+            if boosted_at[current] != boosts or allotment[current] <= 0:
+                allotment[current] = self.quanta[level]
+                boosted_at[current] = boosts
+
+            # Cut by absolute time at the boost and, since new jobs enter the
+            # top level and preempt anything running below it, at the next
+            # arrival, so the clock lands exactly on either.
+            end_time = self.current_time + min(allotment[current], remaining_burst_time[current])
+            tolerance = EPSILON * (1.0 + abs(end_time))
+            if next_boost - end_time <= tolerance:
+                end_time = next_boost
+            if level > 0 and next_index < self.num_processes and arrival_time[order[next_index]] - end_time <= tolerance:
+                end_time = arrival_time[order[next_index]]
+            run_time = end_time - self.current_time
 
-                for i in range(num_processes):
-                    if i != next_process and not completed[i] and self.processes[i]["arrival_time"] <= self.current_time - 1:
-                        self.waiting_times[i] += 1
-                
-                self.gantt_chart.append((start_time, self.current_time, self.processes[next_process]['process_id'], colormap(next_process / num_processes)))
-                        
-                if remaining_burst_time[next_process] == 0:
-                    self.completion_times[next_process] = self.current_time
-                    completed[next_process] = True
-                    self.turnaround_times[next_process] = self.current_time - self.processes[next_process]["arrival_time"]
-     
+            start_time = self.current_time
+            self.current_time = end_time
+            if run_time > 0:
+                self.add_slice(start_time, self.current_time, current)
+
+            if remaining_burst_time[current] - run_time <= tolerance:
+                completion_times[current] = self.current_time
+                if stats is not None:
+                    stats.completed()
+                continue
+
+            remaining_burst_time[current] -= run_time
+            if allotment[current] - run_time <= tolerance:
+                allotment[current] = 0.0
+            else:
+                allotment[current] -= run_time
+            if allotment[current] <= 0:
+                # Arrivals at the quantum boundary queue ahead of the demoted job.
+                next_index = self.admit(queues[0], order, arrival_time, next_index)
+                queues[min(level + 1, self.levels - 1)].append(current)
+            else:
+                queues[level].appendleft(current)
+
+        self.record_completions(completion_times)
+
+    def admit(self, queue, order, arrival_time, next_index):
+        arrived = self.current_time + EPSILON * (1.0 + abs(self.current_time))
+        while next_index < self.num_processes and arrival_time[order[next_index]] <= arrived:
+            queue.append(order[next_index])
+            next_index += 1
+        return next_index
+
+ALGORITHMS = {
+    "FCFS": FCFS,
+    "Priority": Priority,
+    "Priority_pre": Priority_pre,
+    "HRRN": HRRN,
+    "SJF": SJF,
+    "LJF": LJF,
+    "SRTF": SRTF,
+    "LRTF": LRTF,
+    "RoundRobin": RoundRobin,
+    "MLFQ": MLFQ,
+}
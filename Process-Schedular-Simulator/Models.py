@@ -0,0 +1,123 @@
+import numpy as np
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from Workload import Workload
+
+class WorkloadModel(QAbstractTableModel):
+    # Editable process table backed by NumPy columns. Empty cells are NaN,
+    # so a whole imported workload costs three arrays instead of a widget
+    # per cell.
+    headers = ["Arrival Time", "Burst Time", "Priority"]
+
+    def __init__(self):
+        super().__init__()
+        self.process_id = np.zeros(0, dtype=np.int64)
+        self.columns = np.zeros((3, 0))
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self.columns.shape[1]
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+    def flags(self, index):
+        return Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+        value = self.columns[index.column(), index.row()]
+        return "" if np.isnan(value) else f"{value:g}"
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.EditRole:
+            return False
+        text = str(value).strip()
+        try:
+            self.columns[index.column(), index.row()] = float(text) if text else np.nan
+        except ValueError:
+            return False
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def add_row(self):
+        row = self.rowCount()
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.process_id = np.append(self.process_id, self.process_id.max(initial=0) + 1)
+        self.columns = np.hstack((self.columns, np.full((3, 1), np.nan)))
+        self.endInsertRows()
+
+    def clear(self):
+        self.columns[:] = np.nan
+        if self.rowCount():
+            self.dataChanged.emit(self.index(0, 0), self.index(self.rowCount() - 1, self.columnCount() - 1))
+
+    def set_workload(self, workload):
+        self.beginResetModel()
+        self.process_id = workload.process_id.copy()
+        self.columns = np.vstack((workload.arrival_time, workload.burst_time, workload.priority))
+        self.endResetModel()
+
+    def workload(self):
+        return Workload(self.process_id.copy(), *self.columns.copy())
+
+class ResultsModel(QAbstractTableModel):
+    # Read-only view over a finished scheduler's arrays. Cells are formatted
+    # when the view asks for them, so only the visible rows are built.
+    def __init__(self):
+        super().__init__()
+        self.scheduler = None
+        self.headers = ["Process", "Arrival Time", "Burst Time", "Turnaround Time", "Waiting Time", "Completion Time"]
+        self.columns = []
+        self.summary = {}
+
+    def set_scheduler(self, scheduler, show_priority=False):
+        self.beginResetModel()
+        self.scheduler = scheduler
+        processes = scheduler.processes
+        self.headers = ["Process", "Arrival Time", "Burst Time", "Turnaround Time", "Waiting Time", "Completion Time"]
+        self.columns = [processes.process_id, processes.arrival_time, processes.burst_time,
+                        scheduler.turnaround_times, scheduler.waiting_times, scheduler.completion_times]
+        if show_priority:
+            self.headers.insert(3, "Priority")
+            self.columns.insert(3, processes.priority)
+        self.summary = scheduler.summary()
+        self.endResetModel()
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() or self.scheduler is None:
+            return 0
+        return self.scheduler.num_processes + 1
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.headers)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.headers[section]
+        return str(section + 1)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        row, column = index.row(), index.column()
+        if row == self.scheduler.num_processes:
+            if column == 0:
+                return "Average:"
+            name = self.headers[column]
+            if name == "Turnaround Time":
+                return str(self.summary["average_turnaround"])
+            if name == "Waiting Time":
+                return str(self.summary["average_waiting"])
+            return None
+        if column == 0:
+            return str(self.columns[0][row])
+        return str(float(self.columns[column][row]))
@@ -0,0 +1,264 @@
+import heapq
+import math
+import numpy as np
+from Gantt import GanttChart, default_colormap
+from Logic import Scheduler, ReadyQueue, ResponseRatioQueue
+
+POLICIES = ("FCFS", "SJF", "SRTF", "Priority", "HRRN")
+
+class SMP(Scheduler):
+    def __init__(self, processes, policy="FCFS", cores=4, run_queue="global"):
+        super().__init__(processes)
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, choose from {', '.join(POLICIES)}.")
+        if cores < 1:
+            raise ValueError("At least one core is needed.")
+        if run_queue not in ("global", "per_cpu"):
+            raise ValueError("run_queue must be 'global' or 'per_cpu'.")
+        self.policy = policy
+        self.cores = cores
+        self.run_queue = run_queue
+        self.core_gantt = [GanttChart(self.num_processes) for _ in range(cores)]
+        self.busy_times = np.zeros(cores)
+        self.steals = 0
+        self.preemptions = 0
+
+    def make_queue(self):
+        if self.policy == "HRRN":
+            return ResponseRatioQueue(self.arrival_time, self.burst_time)
+        if self.policy == "FCFS":
+            return ReadyQueue(key=lambda i: self.arrival_time[i])
+        if self.policy == "SJF":
+            return ReadyQueue(key=lambda i: self.burst_time[i])
+        if self.policy == "Priority":
+            return ReadyQueue(key=lambda i: (self.priority[i], self.arrival_time[i]))
+        return ReadyQueue(key=lambda i: self.remaining[i])
+
+    def run(self):
+        self.arrival_time = self.processes.arrival_time.tolist()
+        self.burst_time = self.processes.burst_time.tolist()
+        self.priority = self.processes.priority.tolist()
+        self.remaining = list(self.burst_time)
+        self.completion = [0.0] * self.num_processes
+        order = np.argsort(self.processes.arrival_time, kind='stable').tolist()
+
+        self.queues = [self.make_queue() for _ in range(1 if self.run_queue == "global" else self.cores)]
+        self.running = [None] * self.cores
+        self.started = [0.0] * self.cores
+        self.version = [0] * self.cores
+        self.idle = list(range(self.cores))
+        # Completion events and, for SRTF, running jobs ordered by how far
+        # away their completion is. Both are invalidated lazily by bumping
+        # the core's version whenever its job changes.
+        self.events = []
+        self.longest_running = []
+        # Per-CPU mode: (-length, core) entries that bound each non-empty
+        # queue's length from above, so finding a victim to steal from is a
+        # heap peek and not a scan over every core.
+        self.queue_lengths = []
+        next_index = 0
+        next_core = 0
+
+        while next_index < self.num_processes or self.events:
+            next_arrival = self.arrival_time[order[next_index]] if next_index < self.num_processes else math.inf
+            self.current_time = min(next_arrival, self.events[0][0] if self.events else math.inf)
+            touched = []
+
+            while self.events and self.events[0][0] <= self.current_time:
+                _, core, version = heapq.heappop(self.events)
+                if version == self.version[core]:
+                    self.finish(core)
+                    touched.append(core)
+
+            while next_index < self.num_processes and self.arrival_time[order[next_index]] <= self.current_time:
+                i = order[next_index]
+                next_index += 1
+                if self.run_queue == "global":
+                    self.enqueue(0, i)
+                    continue
+                if self.idle:
+                    core = heapq.heappop(self.idle)
+                else:
+                    core = next_core
+                    next_core = (next_core + 1) % self.cores
+                self.enqueue(core, i)
+                touched.append(core)
+
+            if self.run_queue == "global":
+                self.dispatch_global()
+            else:
+                for core in dict.fromkeys(touched):
+                    self.dispatch_local(core)
+
+        self.record_completions(self.completion)
+        starts = np.concatenate([chart.starts for chart in self.core_gantt])
+        ends = np.concatenate([chart.ends for chart in self.core_gantt])
+        pids = np.concatenate([chart.pids for chart in self.core_gantt])
+        slots = np.concatenate([chart.slots for chart in self.core_gantt])
+        for k in np.argsort(starts, kind='stable').tolist():
+            self.gantt_chart.append(float(starts[k]), float(ends[k]), int(pids[k]), int(slots[k]))
+
+    def dispatch_global(self):
+        queue = self.queues[0]
+        while self.idle and len(queue):
+            self.start(heapq.heappop(self.idle), self.pick(queue))
+
+        if self.policy == "SRTF":
+            while len(queue) and self.longest_running:
+                _, _, core, version = self.longest_running[0]
+                if version != self.version[core]:
+                    heapq.heappop(self.longest_running)
+                elif not self.should_preempt(core, queue):
+                    break
+                else:
+                    heapq.heappop(self.longest_running)
+                    self.preempt(core, 0)
+                    self.start(core, self.pick(queue))
+
+    def dispatch_local(self, core):
+        queue = self.queues[core]
+        if self.running[core] is None:
+            if not len(queue):
+                victim = self.longest_queue()
+                if victim is None:
+                    heapq.heappush(self.idle, core)
+                    return
+                self.steals += 1
+                queue = self.queues[victim]
+            self.start(core, self.pick(queue))
+        elif self.policy == "SRTF" and len(queue) and self.should_preempt(core, queue):
+            self.preempt(core, core)
+            self.start(core, self.pick(queue))
+
+    def enqueue(self, q, i):
+        queue = self.queues[q]
+        queue.push(i, self.current_time)
+        if self.run_queue == "per_cpu":
+            heapq.heappush(self.queue_lengths, (-len(queue), q))
+            if len(self.queue_lengths) > 2 * self.cores:
+                self.queue_lengths = [(-len(other), c) for c, other in enumerate(self.queues) if len(other)]
+                heapq.heapify(self.queue_lengths)
+
+    def longest_queue(self):
+        # The lowest numbered of the longest queues, like max(key=len), or
+        # None when all are empty. Queues only shrink by pops, so a top entry
+        # that overstates its queue is fixed up and the peek repeated.
+        lengths = self.queue_lengths
+        while lengths:
+            length, q = lengths[0]
+            actual = len(self.queues[q])
+            if actual == -length:
+                return q
+            if actual:
+                heapq.heapreplace(lengths, (-actual, q))
+            else:
+                heapq.heappop(lengths)
+        return None
+
+    def pick(self, queue):
+        if self.stats is None:
+            return queue.pop(self.current_time)
+        return self.stats.select(len(queue), queue.pop, self.current_time)
+
+    def should_preempt(self, core, queue):
+        i = self.running[core]
+        remaining = self.remaining[i] - (self.current_time - self.started[core])
+        return queue.heap[0] < (remaining, i)
+
+    def start(self, core, i):
+        if self.stats is not None:
+            self.stats.running(i, core)
+        self.running[core] = i
+        self.started[core] = self.current_time
+        self.version[core] += 1
+        finish_time = self.current_time + self.remaining[i]
+        heapq.heappush(self.events, (finish_time, core, self.version[core]))
+        if self.policy == "SRTF":
+            heapq.heappush(self.longest_running, (-finish_time, -i, core, self.version[core]))
+
+    def stop(self, core):
+        i = self.running[core]
+        start_time = self.started[core]
+        if self.current_time > start_time:
+            self.core_gantt[core].append(start_time, self.current_time, int(self.processes.process_id[i]), i)
+        self.busy_times[core] += self.current_time - start_time
+        self.running[core] = None
+        self.version[core] += 1
+        return i
+
+    def finish(self, core):
+        i = self.stop(core)
+        self.completion[i] = self.current_time
+        if self.stats is not None:
+            self.stats.completed(core)
+        if self.run_queue == "global":
+            heapq.heappush(self.idle, core)
+
+    def preempt(self, core, q):
+        started = self.started[core]
+        i = self.stop(core)
+        self.remaining[i] -= self.current_time - started
+        self.preemptions += 1
+        self.enqueue(q, i)
+
+    def cache_state(self):
+        state = super().cache_state()
+        state["busy_times"] = self.busy_times
+        state["counters"] = np.array([self.preemptions, self.steals], dtype=np.int64)
+        state["core_sizes"] = np.array([len(chart) for chart in self.core_gantt], dtype=np.int64)
+        for column in ("starts", "ends", "pids", "slots"):
+            state["core_" + column] = np.concatenate([getattr(chart, column) for chart in self.core_gantt])
+        return state
+
+    def restore_state(self, state):
+        super().restore_state(state)
+        self.busy_times = state["busy_times"]
+        self.preemptions, self.steals = (int(count) for count in state["counters"])
+        bounds = np.concatenate(([0], np.cumsum(state["core_sizes"])))
+        self.core_gantt = [
+            GanttChart.from_arrays(*(state["core_" + column][start:end] for column in ("starts", "ends", "pids", "slots")), self.num_processes)
+            for start, end in zip(bounds[:-1], bounds[1:])
+        ]
+
+    def utilization(self):
+        if not self.num_processes:
+            return np.zeros(self.cores)
+        span = self.completion_times.max() - self.processes.arrival_time.min()
+        return self.busy_times / span if span > 0 else np.zeros(self.cores)
+
+    def summary(self):
+        summary = super().summary()
+        utilization = self.utilization()
+        summary["utilization"] = float(utilization.mean())
+        summary["core_utilization"] = utilization.tolist()
+        summary["preemptions"] = self.preemptions
+        summary["steals"] = self.steals
+        return summary
+
+    def visualize(self, max_segments=None, raster_segments=None):
+        max_segments = self.max_segments if max_segments is None else max_segments
+        raster_segments = self.raster_segments if raster_segments is None else raster_segments
+        fig, ax = self.create_plot(f'Scheduling Visualization ({self.policy}, {self.cores} cores)')
+        starts = np.concatenate([chart.starts for chart in self.core_gantt])
+        ends = np.concatenate([chart.ends for chart in self.core_gantt])
+        slots = np.concatenate([chart.slots for chart in self.core_gantt])
+        cores = np.repeat(np.arange(self.cores), [len(chart) for chart in self.core_gantt])
+
+        # Same downsampling and raster thresholds as the single-CPU chart,
+        # with one row per core.
+        bars = self.fit_segments(starts, ends, cores, slots, self.cores, max_segments, raster_segments) if len(starts) else ()
+        if bars is None:
+            self.draw_raster(ax, starts, ends, cores, slots, self.cores)
+        elif bars:
+            starts, ends, cores, slots = bars
+            colors = default_colormap()(slots / max(self.num_processes, 1))
+            bounds = np.searchsorted(cores, np.arange(self.cores + 1))
+            for core in range(self.cores):
+                members = slice(bounds[core], bounds[core + 1])
+                if bounds[core] < bounds[core + 1]:
+                    ax.broken_barh(np.column_stack((starts[members], ends[members] - starts[members])), (core, 1), facecolors=colors[members])
+        ax.set_ylabel('CPU')
+        ax.set_yticks(np.arange(self.cores) + 0.5)
+        ax.set_yticklabels([f'CPU {core}' for core in range(self.cores)])
+        self.finish_plot(ax)
+        return fig
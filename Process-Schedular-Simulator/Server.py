@@ -0,0 +1,242 @@
+import argparse
+import asyncio
+import json
+import sys
+import time
+from Logic import ReadyQueue, ResponseRatioQueue
+
+POLICIES = ("FCFS", "SJF", "LJF", "SRTF", "Priority", "HRRN")
+QUEUED, RUNNING, CANCELLED = range(3)
+
+class DecisionQueue:
+    # A live ready set for one named queue. Jobs get an internal slot that is
+    # reused once they complete, and each decision is one heap pop, so the
+    # cost grows with log(ready jobs) and not with how many ever ran.
+    # Cancelled jobs stay in the heap and are skipped when they surface.
+    def __init__(self, policy="FCFS"):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy {policy!r}, choose from {', '.join(POLICIES)}.")
+        self.policy = policy
+        self.job_id = []
+        self.arrival_time = []
+        self.burst_time = []
+        self.remaining = []
+        self.priority = []
+        self.sequence = []
+        self.state = []
+        self.free_slots = []
+        self.slot_of = {}
+        self.counter = 0
+        self.queued = 0
+        self.running = 0
+        self.decisions = 0
+        self.ready = self.make_queue()
+
+    def make_queue(self):
+        if self.policy == "HRRN":
+            return ResponseRatioQueue(self.arrival_time, self.burst_time)
+        if self.policy == "FCFS":
+            return ReadyQueue(key=lambda i: (self.arrival_time[i], self.sequence[i]))
+        if self.policy == "SJF":
+            return ReadyQueue(key=lambda i: (self.burst_time[i], self.sequence[i]))
+        if self.policy == "LJF":
+            return ReadyQueue(key=lambda i: (-self.burst_time[i], self.sequence[i]))
+        if self.policy == "Priority":
+            return ReadyQueue(key=lambda i: (self.priority[i], self.arrival_time[i], self.sequence[i]))
+        return ReadyQueue(key=lambda i: (self.remaining[i], self.sequence[i]))
+
+    def __len__(self):
+        return self.queued
+
+    def enqueue(self, slot, now):
+        self.counter += 1
+        self.sequence[slot] = self.counter
+        self.state[slot] = QUEUED
+        self.queued += 1
+        self.ready.push(slot, now)
+
+    def submit(self, job_id, burst_time=0.0, priority=0.0, now=0.0):
+        if job_id in self.slot_of:
+            raise ValueError(f"Job {job_id!r} is already queued or running.")
+        if burst_time < 0:
+            raise ValueError("Burst time must be non-negative.")
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.job_id[slot] = job_id
+            self.arrival_time[slot] = now
+            self.burst_time[slot] = self.remaining[slot] = burst_time
+            self.priority[slot] = priority
+        else:
+            slot = len(self.job_id)
+            self.job_id.append(job_id)
+            self.arrival_time.append(now)
+            self.burst_time.append(burst_time)
+            self.remaining.append(burst_time)
+            self.priority.append(priority)
+            self.sequence.append(0)
+            self.state.append(QUEUED)
+        self.slot_of[job_id] = slot
+        self.enqueue(slot, now)
+
+    def next(self, now, count=1):
+        dispatched = []
+        while len(dispatched) < count and self.queued:
+            slot = self.ready.pop(now)
+            if self.state[slot] == CANCELLED:
+                self.free_slots.append(slot)
+                continue
+            self.state[slot] = RUNNING
+            self.queued -= 1
+            self.running += 1
+            self.decisions += 1
+            dispatched.append(self.job_id[slot])
+        return dispatched
+
+    def running_slot(self, job_id):
+        slot = self.slot_of.get(job_id)
+        if slot is None or self.state[slot] != RUNNING:
+            raise ValueError(f"Job {job_id!r} is not running.")
+        return slot
+
+    def complete(self, job_id):
+        slot = self.running_slot(job_id)
+        del self.slot_of[job_id]
+        self.running -= 1
+        self.free_slots.append(slot)
+
+    def requeue(self, job_id, remaining=None, now=0.0):
+        # A running job handed back, e.g. preempted, with its remaining time.
+        slot = self.running_slot(job_id)
+        if remaining is not None:
+            self.remaining[slot] = remaining
+        self.running -= 1
+        self.enqueue(slot, now)
+
+    def cancel(self, job_id):
+        slot = self.slot_of.get(job_id)
+        if slot is None or self.state[slot] != QUEUED:
+            raise ValueError(f"Job {job_id!r} is not queued.")
+        del self.slot_of[job_id]
+        self.state[slot] = CANCELLED
+        self.queued -= 1
+
+    def stats(self):
+        return {"policy": self.policy, "queued": self.queued, "running": self.running, "decisions": self.decisions}
+
+class DecisionServer:
+    # Newline-delimited JSON. Each request line is a list of operations (or a
+    # single one) and the reply line has one result per operation:
+    #   {"op": "open", "queue": "q", "policy": "SJF"}
+    #   {"op": "submit", "queue": "q", "jobs": [{"id": "a", "burst_time": 3, "priority": 1}]}
+    #   {"op": "next", "queue": "q", "count": 2}
+    #   {"op": "complete", "queue": "q", "jobs": ["a"]}
+    #   {"op": "requeue", "queue": "q", "jobs": [{"id": "b", "remaining": 1.5}]}
+    #   {"op": "cancel", "queue": "q", "jobs": ["c"]}
+    #   {"op": "stats", "queue": "q"}
+    # "time" on an operation overrides the server clock, which counts seconds
+    # since start and is what FCFS, Priority and HRRN age jobs by.
+    def __init__(self):
+        self.queues = {}
+        self.started = time.monotonic()
+
+    def queue(self, op):
+        name = op.get("queue", "default")
+        queue = self.queues.get(name)
+        if queue is None:
+            if "policy" not in op:
+                raise ValueError(f"Unknown queue {name!r}, open it with a policy first.")
+            queue = self.queues[name] = DecisionQueue(op["policy"])
+        elif "policy" in op and op["policy"] != queue.policy:
+            raise ValueError(f"Queue {name!r} already uses {queue.policy}.")
+        return queue
+
+    def apply(self, op):
+        kind = op["op"]
+        queue = self.queue(op)
+        now = op.get("time")
+        if now is None:
+            now = time.monotonic() - self.started
+        if kind == "open":
+            return {"queued": len(queue)}
+        if kind == "submit":
+            for job in op["jobs"]:
+                queue.submit(job["id"], float(job.get("burst_time", 0.0)), float(job.get("priority", 0.0)), now)
+            return {"queued": len(queue)}
+        if kind == "next":
+            return {"dispatched": queue.next(now, int(op.get("count", 1)))}
+        if kind == "complete":
+            for job_id in op["jobs"]:
+                queue.complete(job_id)
+            return {"completed": len(op["jobs"])}
+        if kind == "requeue":
+            for job in op["jobs"]:
+                queue.requeue(job["id"], job.get("remaining"), now)
+            return {"queued": len(queue)}
+        if kind == "cancel":
+            for job_id in op["jobs"]:
+                queue.cancel(job_id)
+            return {"queued": len(queue)}
+        if kind == "stats":
+            return queue.stats()
+        raise ValueError(f"Unknown operation {kind!r}.")
+
+    def handle(self, ops):
+        if isinstance(ops, dict):
+            ops = [ops]
+        elif not isinstance(ops, list):
+            return [{"error": "A request must be an operation object or a list of them."}]
+        results = []
+        for op in ops:
+            if not isinstance(op, dict):
+                results.append({"error": "An operation must be an object."})
+                continue
+            try:
+                results.append(self.apply(op))
+            except KeyError as e:
+                results.append({"error": f"Missing field {e.args[0]!r}."})
+            except (TypeError, ValueError) as e:
+                results.append({"error": str(e)})
+        return results
+
+    async def serve_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    results = self.handle(json.loads(line))
+                except ValueError as e:
+                    # JSONDecodeError, or UnicodeDecodeError on bytes that are not UTF-8.
+                    results = [{"error": f"Invalid JSON: {e}"}]
+                writer.write(json.dumps(results).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, unix=None, host='127.0.0.1', port=7878):
+        if unix:
+            return await asyncio.start_unix_server(self.serve_client, path=unix, limit=2 ** 24)
+        return await asyncio.start_server(self.serve_client, host, port, limit=2 ** 24)
+
+async def serve(unix=None, host='127.0.0.1', port=7878):
+    server = await DecisionServer().start(unix, host, port)
+    async with server:
+        await server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve scheduling decisions over a local socket.")
+    parser.add_argument("--unix", metavar="PATH", help="listen on this Unix socket instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1", help="TCP address to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=7878, help="TCP port to listen on (default: 7878)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.unix, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
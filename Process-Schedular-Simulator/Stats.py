@@ -0,0 +1,136 @@
+import time
+
+class Histogram:
+    # Power-of-two buckets: bucket k counts values in (2**(k-1), 2**k].
+    __slots__ = ('buckets', 'count', 'total')
+
+    def __init__(self):
+        self.buckets = []
+        self.count = 0
+        self.total = 0
+
+    def observe(self, value):
+        bucket = (int(value) - 1).bit_length() if value > 1 else 0
+        if bucket >= len(self.buckets):
+            self.buckets.extend([0] * (bucket + 1 - len(self.buckets)))
+        self.buckets[bucket] += 1
+        self.count += 1
+        self.total += value
+
+    def cumulative(self):
+        running = 0
+        for bucket, count in enumerate(self.buckets):
+            running += count
+            yield 2 ** bucket, running
+
+    def as_dict(self):
+        return {"count": self.count, "sum": self.total, "buckets": {str(bound): count for bound, count in self.cumulative()}}
+
+class Cancelled(Exception):
+    pass
+
+class ProgressMonitor:
+    # Stands in for SchedulerStats to report completed jobs every `every`
+    # completions, and lets another thread stop the run at the next decision.
+    def __init__(self, total, callback, every=None):
+        self.total = total
+        self.callback = callback
+        self.every = every or max(1, total // 100)
+        self.done = 0
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
+
+    def select(self, ready_length, pick, *args):
+        return pick(*args)
+
+    def running(self, index, core=0):
+        if self.cancelled:
+            raise Cancelled()
+
+    def completed(self, core=0):
+        if self.cancelled:
+            raise Cancelled()
+        self.done += 1
+        if self.done % self.every == 0 or self.done == self.total:
+            self.callback(self.done)
+
+class SchedulerStats:
+    def __init__(self, timing=False):
+        self.timing = timing
+        self.decisions = 0
+        self.context_switches = 0
+        self.preemptions = 0
+        self.run_seconds = 0.0
+        self.ready_queue_length = Histogram()
+        self.selection_ns = Histogram()
+        self.last = {}
+        self.unfinished = {}
+
+    def select(self, ready_length, pick, *args):
+        self.ready_queue_length.observe(ready_length)
+        if not self.timing:
+            return pick(*args)
+        start = time.perf_counter_ns()
+        result = pick(*args)
+        self.selection_ns.observe(time.perf_counter_ns() - start)
+        return result
+
+    def running(self, index, core=0):
+        self.decisions += 1
+        if self.last.get(core) != index:
+            self.context_switches += 1
+            if self.unfinished.get(core):
+                self.preemptions += 1
+        self.last[core] = index
+        self.unfinished[core] = True
+
+    def completed(self, core=0):
+        self.unfinished[core] = False
+
+    def as_dict(self):
+        stats = {
+            "decisions": self.decisions,
+            "context_switches": self.context_switches,
+            "preemptions": self.preemptions,
+            "run_seconds": self.run_seconds,
+            "ready_queue_length": self.ready_queue_length.as_dict(),
+        }
+        if self.timing:
+            stats["selection_ns"] = self.selection_ns.as_dict()
+        return stats
+
+    def to_prometheus(self, **labels):
+        label_text = ','.join(f'{key}="{value}"' for key, value in sorted(labels.items()))
+        lines = []
+
+        def sample(name, value, extra=''):
+            joined = ','.join(part for part in (label_text, extra) if part)
+            lines.append(f"{name}{{{joined}}} {value}" if joined else f"{name} {value}")
+
+        for name, help_text, value in (
+            ("scheduler_decisions_total", "Scheduling decisions made.", self.decisions),
+            ("scheduler_context_switches_total", "Dispatches of a different process than the one before.", self.context_switches),
+            ("scheduler_preemptions_total", "Processes switched out before completing.", self.preemptions),
+        ):
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} counter")
+            sample(name, value)
+
+        lines.append("# HELP scheduler_run_seconds Wall time of the last profiled run.")
+        lines.append("# TYPE scheduler_run_seconds gauge")
+        sample("scheduler_run_seconds", self.run_seconds)
+
+        histograms = [("scheduler_ready_queue_length", "Ready queue length at each decision.", self.ready_queue_length, 1)]
+        if self.timing:
+            histograms.append(("scheduler_selection_seconds", "Time spent picking the next process.", self.selection_ns, 1e-9))
+        for name, help_text, histogram, scale in histograms:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} histogram")
+            for bound, count in histogram.cumulative():
+                sample(f"{name}_bucket", count, f'le="{bound * scale:g}"')
+            sample(f"{name}_bucket", histogram.count, 'le="+Inf"')
+            sample(f"{name}_sum", histogram.total * scale)
+            sample(f"{name}_count", histogram.count)
+        return '\n'.join(lines) + '\n'
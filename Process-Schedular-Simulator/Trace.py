@@ -0,0 +1,129 @@
+import numpy as np
+from Gantt import GanttChart
+from Logic import ALGORITHMS, Scheduler
+from Workload import Workload
+
+# Layout: one 64 byte header, then num_processes PROCESS records, then
+# num_segments SEGMENT records, all little-endian and fixed width so the file
+# can be mapped straight into structured arrays.
+MAGIC = b'SCHTRACE'
+VERSION = 1
+HEADER = np.dtype([
+    ('magic', 'S8'), ('version', '<u4'), ('flags', '<u4'), ('algorithm', 'S16'),
+    ('num_processes', '<u8'), ('num_segments', '<u8'), ('process_offset', '<u8'), ('segment_offset', '<u8'),
+])
+PROCESS = np.dtype([
+    ('process_id', '<i8'), ('arrival_time', '<f8'), ('burst_time', '<f8'), ('priority', '<f8'), ('completion_time', '<f8'),
+])
+SEGMENT = np.dtype([('start', '<f8'), ('end', '<f8'), ('process_id', '<i8'), ('slot', '<i8')])
+
+class Trace:
+    def __init__(self, path, mode='r'):
+        self.path = path
+        self.data = np.memmap(path, dtype=np.uint8, mode=mode)
+        if len(self.data) < HEADER.itemsize:
+            raise ValueError(f"{path} is too short to be a trace.")
+        self.header = self.data[:HEADER.itemsize].view(HEADER)[0]
+        if self.header['magic'] != MAGIC:
+            raise ValueError(f"{path} is not a trace file.")
+        if self.header['version'] != VERSION:
+            raise ValueError(f"{path} has trace version {self.header['version']}, expected {VERSION}.")
+        process_offset, segment_offset = int(self.header['process_offset']), int(self.header['segment_offset'])
+        self.processes = self.data[process_offset:process_offset + self.num_processes * PROCESS.itemsize].view(PROCESS)
+        self.segments = self.data[segment_offset:segment_offset + self.num_segments * SEGMENT.itemsize].view(SEGMENT)
+
+    @property
+    def algorithm(self):
+        return self.header['algorithm'].decode()
+
+    @property
+    def num_processes(self):
+        return int(self.header['num_processes'])
+
+    @property
+    def num_segments(self):
+        return int(self.header['num_segments'])
+
+    @property
+    def completion_times(self):
+        return self.processes['completion_time']
+
+    def workload(self):
+        # Field views into the map, nothing is copied until a scheduler reorders.
+        p = self.processes
+        return Workload(p['process_id'], p['arrival_time'], p['burst_time'], p['priority'])
+
+    def gantt_chart(self):
+        s = self.segments
+        return GanttChart.from_arrays(s['start'], s['end'], s['process_id'], s['slot'], self.num_processes)
+
+    def scheduler(self):
+        # A finished scheduler rebuilt from the trace without running it, so
+        # summary() and visualize() work on recorded results.
+        scheduler = ALGORITHMS.get(self.algorithm, Scheduler)(self.workload())
+        if not np.isnan(self.completion_times).any():
+            scheduler.record_completions(self.completion_times)
+        scheduler.gantt_chart = self.gantt_chart()
+        return scheduler
+
+    def diff(self, other):
+        # Compares completion times per process id and the segment streams.
+        mine, theirs = np.argsort(self.processes['process_id']), np.argsort(other.processes['process_id'])
+        if not np.array_equal(self.processes['process_id'][mine], other.processes['process_id'][theirs]):
+            raise ValueError("Traces are over different processes.")
+        delta = other.completion_times[theirs] - self.completion_times[mine]
+        changed = np.flatnonzero(delta != 0)
+        segments = min(self.num_segments, other.num_segments)
+        differing = np.flatnonzero(self.segments[:segments] != other.segments[:segments])
+        if len(differing):
+            first_segment = int(differing[0])
+        elif self.num_segments != other.num_segments:
+            first_segment = segments
+        else:
+            first_segment = None
+        return {
+            "changed_processes": self.processes['process_id'][mine][changed],
+            "max_completion_delta": float(np.abs(delta).max(initial=0)),
+            "first_differing_segment": first_segment,
+        }
+
+    @classmethod
+    def write(cls, path, processes, scheduler=None, algorithm=None):
+        # With a scheduler its reordered processes, completion times and Gantt
+        # segments are stored; without one completion times are NaN.
+        if scheduler is not None:
+            processes = scheduler.processes
+            chart = scheduler.gantt_chart
+            algorithm = algorithm or type(scheduler).__name__
+        else:
+            processes = Workload.coerce(processes)
+            chart = GanttChart(len(processes))
+        process_offset = HEADER.itemsize
+        segment_offset = process_offset + len(processes) * PROCESS.itemsize
+        size = segment_offset + len(chart) * SEGMENT.itemsize
+
+        data = np.memmap(path, dtype=np.uint8, mode='w+', shape=(size,))
+        header = data[:HEADER.itemsize].view(HEADER)
+        header['magic'] = MAGIC
+        header['version'] = VERSION
+        header['algorithm'] = (algorithm or '').encode()[:16]
+        header['num_processes'] = len(processes)
+        header['num_segments'] = len(chart)
+        header['process_offset'] = process_offset
+        header['segment_offset'] = segment_offset
+
+        records = data[process_offset:segment_offset].view(PROCESS)
+        records['process_id'] = processes.process_id
+        records['arrival_time'] = processes.arrival_time
+        records['burst_time'] = processes.burst_time
+        records['priority'] = processes.priority
+        records['completion_time'] = scheduler.completion_times if scheduler is not None else np.nan
+
+        segments = data[segment_offset:].view(SEGMENT)
+        segments['start'] = chart.starts
+        segments['end'] = chart.ends
+        segments['process_id'] = chart.pids
+        segments['slot'] = chart.slots
+        data.flush()
+        del header, records, segments, data
+        return cls(path)
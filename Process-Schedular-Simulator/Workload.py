@@ -0,0 +1,69 @@
+import numpy as np
+
+class Workload:
+    __slots__ = ('process_id', 'arrival_time', 'burst_time', 'priority')
+
+    def __init__(self, process_id, arrival_time, burst_time, priority=None):
+        self.process_id = np.asarray(process_id, dtype=np.int64)
+        self.arrival_time = np.asarray(arrival_time, dtype=np.float64)
+        self.burst_time = np.asarray(burst_time, dtype=np.float64)
+        if priority is None:
+            self.priority = np.zeros(len(self.process_id), dtype=np.float64)
+        else:
+            self.priority = np.asarray(priority, dtype=np.float64)
+
+        if not (len(self.process_id) == len(self.arrival_time) == len(self.burst_time) == len(self.priority)):
+            raise ValueError("All workload columns must have the same length.")
+
+    @classmethod
+    def from_records(cls, processes):
+        return cls(
+            [p["process_id"] for p in processes],
+            [p["arrival_time"] for p in processes],
+            [p["burst_time"] for p in processes],
+            [p.get("priority", 0) for p in processes],
+        )
+
+    @classmethod
+    def coerce(cls, processes):
+        if isinstance(processes, cls):
+            return processes
+        return cls.from_records(processes)
+
+    def __len__(self):
+        return len(self.process_id)
+
+    def __getitem__(self, i):
+        return {
+            "process_id": int(self.process_id[i]),
+            "arrival_time": float(self.arrival_time[i]),
+            "burst_time": float(self.burst_time[i]),
+            "priority": float(self.priority[i]),
+        }
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    def take(self, order):
+        return Workload(self.process_id[order], self.arrival_time[order], self.burst_time[order], self.priority[order])
+
+    def records(self):
+        return list(self)
+
+    @classmethod
+    def generate(cls, n, seed=0, arrival_rate=1.0, mean_burst=4.0, burst_alpha=1.5, priority_levels=5, priority_run=8.0):
+        # Poisson arrivals, Pareto (heavy-tailed) bursts scaled to mean_burst,
+        # and priorities that stick for geometric runs of about priority_run
+        # jobs so high and low priority work arrives in bursts.
+        rng = np.random.default_rng(seed)
+        arrival_time = np.cumsum(rng.exponential(1.0 / arrival_rate, n))
+        if n:
+            arrival_time -= arrival_time[0]
+        scale = mean_burst * (burst_alpha - 1) / burst_alpha if burst_alpha > 1 else mean_burst
+        burst_time = (rng.pareto(burst_alpha, n) + 1) * scale
+        switches = rng.random(n) < 1.0 / priority_run
+        switches[:1] = True
+        levels = rng.integers(1, priority_levels + 1, int(switches.sum()))
+        priority = levels[np.cumsum(switches) - 1]
+        return cls(np.arange(1, n + 1), arrival_time, burst_time, priority)
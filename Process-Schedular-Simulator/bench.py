@@ -0,0 +1,134 @@
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+import numpy as np
+from Logic import ALGORITHMS
+from Workload import Workload
+
+def time_run(algorithm, workload, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        ALGORITHMS[algorithm](workload).run()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def peak_memory(algorithm, workload):
+    tracemalloc.start()
+    try:
+        ALGORITHMS[algorithm](workload).run()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def predicted_time(timings, size):
+    # Extrapolates from the two largest measured sizes with their observed
+    # growth exponent, clamped to between linear and quadratic. A single
+    # measurement is taken as quadratic, the worst case of the engines here.
+    (last_size, last_time), = timings[-1:]
+    exponent = 2.0
+    if len(timings) > 1:
+        first_size, first_time = timings[-2]
+        if first_time > 0 and last_time > 0:
+            exponent = min(max(np.log(last_time / first_time) / np.log(last_size / first_size), 1.0), 2.0)
+    return last_time * (size / last_size) ** exponent
+
+def run_benchmarks(algorithms, sizes, seed=0, load=0.9, mean_burst=4.0, repeat=3, budget=30.0, memory=True, log=None):
+    results = []
+    timings = {algorithm: [] for algorithm in algorithms}
+    for size in sorted(sizes):
+        workload = Workload.generate(size, seed=seed, arrival_rate=load / mean_burst, mean_burst=mean_burst)
+        for algorithm in algorithms:
+            # Skip before running, quadratic engines would take hours to show
+            # they are over budget at the next size.
+            predicted = predicted_time(timings[algorithm], size) if timings[algorithm] else 0.0
+            if predicted > budget:
+                results.append({"algorithm": algorithm, "size": size, "skipped": True, "predicted_wall_time": predicted})
+                if log:
+                    log(f"{algorithm:>12} {size:>9} skipped, predicted {predicted:.0f}s")
+                continue
+            wall_time = time_run(algorithm, workload, repeat)
+            result = {
+                "algorithm": algorithm,
+                "size": size,
+                "wall_time": wall_time,
+                "ops_per_sec": size / wall_time if wall_time > 0 else float('inf'),
+            }
+            if memory:
+                result["peak_memory"] = peak_memory(algorithm, workload)
+            results.append(result)
+            timings[algorithm].append((size, wall_time))
+            if log:
+                log(f"{algorithm:>12} {size:>9} {wall_time:10.4f}s {result['ops_per_sec']:14.0f} jobs/s")
+    return results
+
+def find_regressions(results, baseline, threshold):
+    previous = {(r["algorithm"], r["size"]): r for r in baseline["results"] if not r.get("skipped")}
+    regressions = []
+    for result in results:
+        old = previous.get((result["algorithm"], result["size"]))
+        if not old:
+            continue
+        if result.get("skipped"):
+            # Measured before but now predicted over budget: the kind of
+            # slowdown the skip would otherwise hide.
+            predicted = result["predicted_wall_time"]
+            regressions.append({**result, "baseline_wall_time": old["wall_time"], "slowdown": predicted / old["wall_time"] if old["wall_time"] > 0 else float('inf')})
+        elif result["wall_time"] > old["wall_time"] * (1 + threshold):
+            regressions.append({**result, "baseline_wall_time": old["wall_time"], "slowdown": result["wall_time"] / old["wall_time"]})
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark every scheduler on generated workloads.")
+    parser.add_argument("--sizes", default="10,100,1000,10000", help="comma separated workload sizes (default: 10,100,1000,10000)")
+    parser.add_argument("-a", "--algorithm", action="append", help="scheduler to benchmark, repeatable or comma separated (default: all)")
+    parser.add_argument("--seed", type=int, default=0, help="workload generator seed")
+    parser.add_argument("--load", type=float, default=0.9, help="offered CPU load of the generated workloads")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case, the fastest is reported")
+    parser.add_argument("--budget", type=float, default=30.0, help="skip a size for an algorithm when one run is predicted to take longer than this many seconds")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced peak memory pass")
+    parser.add_argument("-o", "--output", help="write results as JSON to this file")
+    parser.add_argument("--baseline", help="earlier JSON results to compare against")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown against the baseline before failing (default: 0.2 = 20%%)")
+    args = parser.parse_args(argv)
+
+    algorithms = [name for value in args.algorithm or list(ALGORITHMS) for name in value.split(',')]
+    for name in algorithms:
+        if name not in ALGORITHMS:
+            parser.error(f"Unknown algorithm {name!r}, choose from {', '.join(ALGORITHMS)}.")
+    sizes = [int(size) for size in args.sizes.split(',')]
+
+    results = run_benchmarks(algorithms, sizes, args.seed, args.load, repeat=args.repeat, budget=args.budget,
+                             memory=not args.no_memory, log=lambda line: print(line, file=sys.stderr))
+    report = {
+        "meta": {"python": platform.python_version(), "numpy": np.__version__, "seed": args.seed, "load": args.load, "repeat": args.repeat},
+        "results": results,
+    }
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = find_regressions(results, json.load(f), args.threshold)
+        for regression in report["regressions"]:
+            if regression.get("skipped"):
+                now = f"skipped, predicted {regression['predicted_wall_time']:.4f}s"
+            else:
+                now = f"{regression['wall_time']:.4f}s"
+            print(f"REGRESSION {regression['algorithm']} size {regression['size']}: "
+                  f"{regression['baseline_wall_time']:.4f}s -> {now}", file=sys.stderr)
+        status = 1 if report["regressions"] else 0
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+            f.write('\n')
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return status
+
+if __name__ == '__main__':
+    sys.exit(main())
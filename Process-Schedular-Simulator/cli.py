@@ -0,0 +1,158 @@
+import argparse
+import csv
+import json
+import os
+import sys
+from Logic import ALGORITHMS
+from Trace import Trace
+from Workload import Workload
+
+def read_workload(path, input_format=None):
+    input_format = input_format or os.path.splitext(path)[1].lstrip('.').lower()
+    if input_format == 'trace':
+        return Trace(path).workload()
+    stream = sys.stdin if path == '-' else open(path, newline='')
+
+    try:
+        if input_format == 'csv':
+            records = list(csv.DictReader(stream))
+        elif input_format == 'json':
+            records = json.load(stream)
+            if isinstance(records, dict):
+                records = records["processes"]
+        elif input_format == 'jsonl':
+            records = [json.loads(line) for line in stream if line.strip()]
+        else:
+            raise ValueError(f"Unknown workload format: {input_format!r}")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    for i, record in enumerate(records):
+        try:
+            process_id = record.get("process_id")
+            record["process_id"] = int(i + 1 if process_id in (None, "") else process_id)
+            record["arrival_time"] = float(record["arrival_time"])
+            record["burst_time"] = float(record["burst_time"])
+            record["priority"] = float(record.get("priority") or 0)
+        except KeyError as e:
+            raise ValueError(f"Process {i + 1} has no {e.args[0]} field.")
+    return Workload.from_records(records)
+
+def parse_algorithms(values):
+    names = []
+    for value in values or ["FCFS"]:
+        for name in value.split(','):
+            if name == 'all':
+                names.extend(ALGORITHMS)
+            elif name in ALGORITHMS:
+                names.append(name)
+            else:
+                raise ValueError(f"Unknown algorithm {name!r}, choose from {', '.join(ALGORITHMS)} or all.")
+    return list(dict.fromkeys(names))
+
+def process_rows(scheduler):
+    processes = scheduler.processes
+    return zip(
+        processes.process_id.tolist(), processes.arrival_time.tolist(), processes.burst_time.tolist(),
+        processes.priority.tolist(), scheduler.turnaround_times.tolist(), scheduler.waiting_times.tolist(),
+        scheduler.completion_times.tolist(),
+    )
+
+PROCESS_FIELDS = ["process_id", "arrival_time", "burst_time", "priority", "turnaround_time", "waiting_time", "completion_time"]
+WORKLOAD_FIELDS = PROCESS_FIELDS[:4]
+
+def write_workload(workload, stream, output_format):
+    rows = zip(workload.process_id.tolist(), workload.arrival_time.tolist(), workload.burst_time.tolist(), workload.priority.tolist())
+    if output_format == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(WORKLOAD_FIELDS)
+        writer.writerows(rows)
+    else:
+        json.dump({"processes": [dict(zip(WORKLOAD_FIELDS, row)) for row in rows]}, stream, indent=2)
+        stream.write('\n')
+
+def write_metrics(schedulers, stream, output_format):
+    if output_format == 'csv':
+        writer = csv.writer(stream)
+        writer.writerow(["algorithm"] + PROCESS_FIELDS)
+        for name, scheduler in schedulers.items():
+            for row in process_rows(scheduler):
+                writer.writerow([name, *row])
+    else:
+        results = {
+            name: {
+                "summary": scheduler.summary(),
+                "processes": [dict(zip(PROCESS_FIELDS, row)) for row in process_rows(scheduler)],
+            }
+            for name, scheduler in schedulers.items()
+        }
+        json.dump(results, stream, indent=2)
+        stream.write('\n')
+
+def write_gantt(schedulers, stream):
+    writer = csv.writer(stream)
+    writer.writerow(["algorithm", "start", "end", "process_id"])
+    for name, scheduler in schedulers.items():
+        for start, end, pid in scheduler.gantt_chart.segments():
+            writer.writerow([name, start, end, pid])
+
+def save_plots(schedulers, prefix):
+    import matplotlib
+    matplotlib.use('Agg')
+    for name, scheduler in schedulers.items():
+        scheduler.visualize().savefig(f"{prefix}_{name}.png")
+
+def save_traces(schedulers, prefix):
+    for name, scheduler in schedulers.items():
+        Trace.write(f"{prefix}_{name}.trace", None, scheduler)
+
+def open_output(path):
+    return sys.stdout if path in (None, '-') else open(path, 'w', newline='')
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the process schedulers on a workload without the GUI.")
+    parser.add_argument("workload", help="CSV, JSON, JSONL or binary trace file with arrival_time, burst_time and optional process_id and priority columns ('-' for stdin)")
+    parser.add_argument("-a", "--algorithm", action="append", help="scheduler to run, repeatable or comma separated, 'all' for every one (default: FCFS)")
+    parser.add_argument("--input-format", choices=["csv", "json", "jsonl", "trace"], help="workload format when it cannot be told from the file extension")
+    parser.add_argument("-f", "--format", choices=["json", "csv"], default="json", help="format of the metrics output")
+    parser.add_argument("-o", "--output", help="metrics output file (default: stdout)")
+    parser.add_argument("--gantt", help="write Gantt segments as CSV to this file ('-' for stdout)")
+    parser.add_argument("--plot", metavar="PREFIX", help="save a Gantt chart per algorithm as PREFIX_<algorithm>.png")
+    parser.add_argument("--trace", metavar="PREFIX", help="save processes, completions and Gantt segments per algorithm as binary PREFIX_<algorithm>.trace")
+    args = parser.parse_args(argv)
+
+    try:
+        algorithms = parse_algorithms(args.algorithm)
+        workload = read_workload(args.workload, args.input_format)
+    except (OSError, ValueError) as e:
+        parser.error(str(e))
+
+    schedulers = {}
+    for name in algorithms:
+        schedulers[name] = ALGORITHMS[name](workload)
+        schedulers[name].run()
+
+    stream = open_output(args.output)
+    try:
+        write_metrics(schedulers, stream, args.format)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    if args.gantt:
+        stream = open_output(args.gantt)
+        try:
+            write_gantt(schedulers, stream)
+        finally:
+            if stream is not sys.stdout:
+                stream.close()
+
+    if args.plot:
+        save_plots(schedulers, args.plot)
+    if args.trace:
+        save_traces(schedulers, args.trace)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import numpy as np
+
+async def connect(args):
+    if args.unix:
+        return await asyncio.open_unix_connection(args.unix, limit=2 ** 24)
+    return await asyncio.open_connection(args.host, args.port, limit=2 ** 24)
+
+async def request(reader, writer, ops):
+    writer.write(json.dumps(ops).encode() + b'\n')
+    await writer.drain()
+    results = json.loads(await reader.readline())
+    for result in results:
+        if "error" in result:
+            raise RuntimeError(result["error"])
+    return results
+
+def jobs(rng, prefix, start, count, mean_burst):
+    return [{"id": f"{prefix}-{k}", "burst_time": rng.expovariate(1.0 / mean_burst), "priority": rng.randint(1, 5)}
+            for k in range(start, start + count)]
+
+async def client(args, number, timing, latencies):
+    # Each request completes the jobs dispatched by the previous one, submits
+    # a new batch and asks for as many decisions, so the ready set stays at
+    # the backlog size while the run lasts. Timing starts once every
+    # connection has filled its backlog.
+    rng = random.Random(args.seed + number)
+    queue = f"{args.queue}-{number % args.queues}"
+    prefix = f"c{number}"
+    reader, writer = await connect(args)
+    try:
+        await request(reader, writer, [{"op": "open", "queue": queue, "policy": args.policy}])
+        submitted = 0
+        while submitted < args.backlog:
+            count = min(args.batch * 64, args.backlog - submitted)
+            await request(reader, writer, [{"op": "submit", "queue": queue, "jobs": jobs(rng, prefix, submitted, count, args.mean_burst)}])
+            submitted += count
+
+        timing["waiting"] -= 1
+        if not timing["waiting"]:
+            timing["start"] = time.perf_counter()
+            timing["go"].set()
+        await timing["go"].wait()
+        deadline = timing["start"] + args.duration
+        decisions = 0
+        running = []
+        while time.perf_counter() < deadline:
+            ops = [{"op": "complete", "queue": queue, "jobs": running}] if running else []
+            ops.append({"op": "submit", "queue": queue, "jobs": jobs(rng, prefix, submitted, args.batch, args.mean_burst)})
+            ops.append({"op": "next", "queue": queue, "count": args.batch})
+            start = time.perf_counter()
+            results = await request(reader, writer, ops)
+            latencies.append(time.perf_counter() - start)
+            submitted += args.batch
+            running = results[-1]["dispatched"]
+            decisions += len(running)
+        return decisions
+    finally:
+        writer.close()
+
+async def run(args):
+    latencies = []
+    timing = {"waiting": args.connections, "go": asyncio.Event()}
+    decisions = await asyncio.gather(*(client(args, number, timing, latencies) for number in range(args.connections)))
+    elapsed = time.perf_counter() - timing["start"]
+    latencies = np.array(latencies) * 1000
+    return {
+        "policy": args.policy,
+        "connections": args.connections,
+        "batch": args.batch,
+        "backlog": args.backlog,
+        "requests": len(latencies),
+        "decisions": sum(decisions),
+        "decisions_per_sec": sum(decisions) / elapsed,
+        "latency_ms": {
+            "p50": float(np.percentile(latencies, 50)) if len(latencies) else 0.0,
+            "p99": float(np.percentile(latencies, 99)) if len(latencies) else 0.0,
+            "mean": float(latencies.mean()) if len(latencies) else 0.0,
+            "max": float(latencies.max(initial=0)),
+        },
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test a running decision server and report latency and throughput.")
+    parser.add_argument("--unix", metavar="PATH", help="connect to this Unix socket instead of TCP")
+    parser.add_argument("--host", default="127.0.0.1", help="server TCP address (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=7878, help="server TCP port (default: 7878)")
+    parser.add_argument("--policy", default="SJF", help="policy of the queues the test opens (default: SJF)")
+    parser.add_argument("--queue", default="load", help="prefix of the queue names")
+    parser.add_argument("--queues", type=int, default=1, help="number of named queues the connections spread over")
+    parser.add_argument("--connections", type=int, default=4, help="concurrent client connections")
+    parser.add_argument("--batch", type=int, default=16, help="jobs submitted and decisions asked for per request")
+    parser.add_argument("--backlog", type=int, default=10000, help="jobs each connection keeps waiting in its queue")
+    parser.add_argument("--mean-burst", type=float, default=4.0, help="mean of the exponential burst times")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run")
+    parser.add_argument("--seed", type=int, default=0, help="random seed")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    print(f"{report['decisions_per_sec']:.0f} decisions/s, p50 {report['latency_ms']['p50']:.3f} ms, "
+          f"p99 {report['latency_ms']['p99']:.3f} ms per request of {args.batch}", file=sys.stderr)
+    json.dump(report, sys.stdout, indent=2)
+    sys.stdout.write('\n')
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
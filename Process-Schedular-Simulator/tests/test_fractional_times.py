@@ -0,0 +1,83 @@
+import numpy as np
+from Events import BurstWorkload, EventScheduler
+from Logic import LJF, LRTF, MLFQ, SJF, Priority, RoundRobin, SRTF, Priority_pre
+
+# Workloads with one decimal place, checked against the same workload scaled
+# by ten, whose integer times add up exactly.
+
+def records(rows):
+    return [{"process_id": k + 1, "arrival_time": a, "burst_time": b, "priority": p} for k, (a, b, p) in enumerate(rows)]
+
+def completions(scheduler):
+    return dict(zip(scheduler.processes.process_id.tolist(), scheduler.completion_times.tolist()))
+
+def run(algorithm, rows, **params):
+    scheduler = algorithm(records(rows), **params)
+    scheduler.run()
+    return scheduler
+
+def random_rows(rng, n):
+    return [(rng.integers(0, 60) / 10, rng.integers(1, 50) / 10, int(rng.integers(1, 4))) for _ in range(n)]
+
+def assert_matches_scaled(algorithm, rows, params=None, scaled_params=None):
+    scheduler = run(algorithm, rows, **(params or {}))
+    exact = run(algorithm, [(round(a * 10), round(b * 10), p) for a, b, p in rows], **(scaled_params or {}))
+    # Ties broken by ulp-sized differences may swap jobs, the times may not move.
+    assert np.allclose(np.sort(scheduler.completion_times), np.sort(exact.completion_times) / 10, rtol=0, atol=1e-9)
+    chart = scheduler.gantt_chart
+    assert (chart.ends - chart.starts > 1e-9).all()
+
+def test_run_cut_at_fractional_arrival_completes():
+    rows = [(1.7, 0.6, 0), (2.3, 0.2, 0), (3.5, 2.7, 0)]
+    for algorithm in (LRTF, SRTF, Priority_pre):
+        scheduler = run(algorithm, rows)
+        assert np.allclose(list(completions(scheduler).values()), [2.3, 2.5, 6.2])
+        chart = scheduler.gantt_chart
+        assert (chart.ends > chart.starts).all()
+
+def test_remaining_time_engines_match_scaled_integers():
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        rows = random_rows(rng, int(rng.integers(1, 9)))
+        assert_matches_scaled(SRTF, rows)
+        assert_matches_scaled(Priority_pre, rows)
+
+def test_non_preemptive_engines_match_scaled_integers():
+    rng = np.random.default_rng(3)
+    for _ in range(500):
+        rows = random_rows(rng, int(rng.integers(1, 9)))
+        for algorithm in (SJF, LJF, Priority):
+            assert_matches_scaled(algorithm, rows)
+
+def test_mlfq_cut_at_fractional_arrival_completes():
+    scheduler = run(MLFQ, [(0.2, 3.3, 0), (2.2, 1.1, 0), (4.6, 0.3, 0)])
+    assert np.allclose(list(completions(scheduler).values()), [4.6, 3.3, 4.9])
+
+def test_quantum_engines_match_scaled_integers():
+    rng = np.random.default_rng(1)
+    for _ in range(500):
+        rows = random_rows(rng, int(rng.integers(1, 9)))
+        assert_matches_scaled(RoundRobin, rows, {"quantum": 1}, {"quantum": 10})
+        assert_matches_scaled(MLFQ, rows, {}, {"quanta": [20, 40, 80]})
+        assert_matches_scaled(MLFQ, rows, {"boost_interval": 5}, {"quanta": [20, 40, 80], "boost_interval": 50})
+
+def test_event_core_slices_match_scaled_integers():
+    scheduler = EventScheduler(records([(3.5, 4.7, 0), (9.7, 0.6, 0), (5.5, 2.2, 0), (6.7, 0.7, 0), (2.7, 1.5, 0), (4.8, 4.0, 0)]), "RoundRobin")
+    scheduler.run()
+    assert np.isclose(scheduler.completion_times[5], 14.9)
+
+    rng = np.random.default_rng(2)
+    for _ in range(300):
+        processes, scaled = [], []
+        for k in range(int(rng.integers(1, 7))):
+            bursts = rng.integers(1, 40, 2 * int(rng.integers(1, 4)) - 1).tolist()
+            devices = rng.integers(0, 2, len(bursts) // 2).tolist()
+            arrival = int(rng.integers(0, 60))
+            processes.append({"process_id": k + 1, "arrival_time": arrival / 10, "bursts": [b / 10 for b in bursts], "devices": devices})
+            scaled.append({"process_id": k + 1, "arrival_time": arrival, "bursts": bursts, "devices": devices})
+        for policy, params, scaled_params in (("RoundRobin", {"quantum": 0.5}, {"quantum": 5}), ("MLFQ", {"boost_interval": 5}, {"quanta": [20, 40, 80], "boost_interval": 50})):
+            scheduler = EventScheduler(BurstWorkload.from_records(processes), policy, **params)
+            scheduler.run()
+            exact = EventScheduler(BurstWorkload.from_records(scaled), policy, **scaled_params)
+            exact.run()
+            assert np.allclose(scheduler.completion_times, exact.completion_times / 10, rtol=0, atol=1e-9)